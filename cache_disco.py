@@ -0,0 +1,172 @@
+# cache_disco.py
+# -*- coding: utf-8 -*-
+
+# Cache simples em disco (Parquet) com TTL baseado no mtime do arquivo.
+# Serve para as séries baixadas de APIs (SGS/BCB etc.): um processo novo do
+# Streamlit (ou o script diário) reaproveita o que já foi baixado no mesmo
+# dia em vez de repetir a chamada HTTP.
+
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Raiz dos caches de respostas HTTP (um subdiretório por fonte)
+DIR_CACHE_HTTP = Path(__file__).resolve().parent / "data" / ".cache"
+
+# TTL "infinito": usado para cair no último cache salvo quando a API falha
+SEM_EXPIRAR = float("inf")
+
+# Instante (epoch) da última invalidação manual (botão "Atualizar dados"):
+# em ler_ou_baixar, arquivo gravado antes disso conta como vencido.
+_VALIDO_DESDE = 0.0
+
+
+class CacheDisco:
+    """
+    Guarda DataFrames em `<diretorio>/<chave>.parquet`.
+
+    - ler(chave, ttl_segundos): devolve o DataFrame se o arquivo existir e
+      tiver sido gravado há menos de `ttl_segundos`; senão, None.
+    - salvar(chave, df): grava (de forma atômica) o DataFrame em Parquet.
+
+    Qualquer erro de leitura/escrita é tratado como "cache miss": o cache
+    nunca derruba quem está chamando.
+    """
+
+    def __init__(self, diretorio: Path, compressao: str = "zstd") -> None:
+        self.diretorio = Path(diretorio)
+        self.compressao = compressao
+
+    def caminho(self, chave: str) -> Path:
+        # troca caracteres problemáticos em nome de arquivo (ex.: "/" das datas)
+        nome = re.sub(r"[^0-9A-Za-z_.-]", "-", chave)
+        return self.diretorio / f"{nome}.parquet"
+
+    def ler(self, chave: str, ttl_segundos: float) -> Optional[pd.DataFrame]:
+        caminho = self.caminho(chave)
+        try:
+            idade = time.time() - caminho.stat().st_mtime
+        except OSError:
+            return None
+
+        if idade >= ttl_segundos:
+            return None
+
+        try:
+            return pd.read_parquet(caminho, engine="pyarrow")
+        except Exception as exc:
+            logger.debug("Cache em disco ilegível (%s): %s", caminho, exc)
+            return None
+
+    def salvar(self, chave: str, df: pd.DataFrame) -> None:
+        caminho = self.caminho(chave)
+        tmp = caminho.with_suffix(".parquet.tmp")
+        try:
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(tmp, compression=self.compressao, index=False)
+            os.replace(tmp, caminho)
+        except Exception as exc:
+            logger.debug("Falha ao gravar cache em disco (%s): %s", caminho, exc)
+
+
+def invalidar_cache_disco() -> None:
+    """
+    Marca todo o cache gravado até agora como vencido para ler_ou_baixar
+    (as próximas leituras vão à rede). Os arquivos ficam no disco como
+    reserva caso a API falhe.
+    """
+    global _VALIDO_DESDE
+    _VALIDO_DESDE = time.time()
+
+
+def ler_ou_baixar(
+    cache: CacheDisco,
+    chave: str,
+    ttl_segundos: float,
+    baixar: Callable[..., pd.DataFrame],
+    *args,
+) -> pd.DataFrame:
+    """
+    Devolve o DataFrame do cache em disco se tiver menos de `ttl_segundos`
+    (e tiver sido gravado depois da última invalidar_cache_disco); senão
+    chama baixar(*args) e grava o resultado. Se o download falhar, cai no
+    último arquivo salvo (qualquer idade) ou, sem ele, deixa a exceção
+    subir.
+    """
+    ttl_segundos = min(ttl_segundos, time.time() - _VALIDO_DESDE)
+    df = cache.ler(chave, ttl_segundos)
+    if df is not None:
+        return df
+
+    try:
+        df = baixar(*args)
+    except Exception:
+        df_antigo = cache.ler(chave, SEM_EXPIRAR)
+        if df_antigo is None:
+            raise
+        logger.warning("Falha ao baixar %s; usando cache em disco.", chave)
+        return df_antigo
+
+    cache.salvar(chave, df)
+    return df
+
+
+# =============================================================================
+# PARQUET "IRMÃO" DE UM CSV LOCAL
+# =============================================================================
+# Os históricos em data/ continuam em CSV (compatibilidade / diff no git),
+# mas quem grava também pode deixar um .parquet ao lado. Na leitura, o
+# parquet só é usado se for pelo menos tão novo quanto o CSV.
+
+
+def caminho_parquet(caminho_csv) -> Path:
+    """data/x/arquivo.csv -> data/x/arquivo.parquet"""
+    return Path(caminho_csv).with_suffix(".parquet")
+
+
+def ler_parquet_irmao(caminho_csv, colunas=None) -> Optional[pd.DataFrame]:
+    """
+    Lê o .parquet ao lado de `caminho_csv`, se existir e não estiver
+    desatualizado em relação ao CSV. Devolve None caso contrário
+    (o chamador cai na leitura do CSV).
+    """
+    caminho_pq = caminho_parquet(caminho_csv)
+    try:
+        mtime_pq = caminho_pq.stat().st_mtime
+    except OSError:
+        return None
+
+    try:
+        if Path(caminho_csv).stat().st_mtime > mtime_pq:
+            return None
+    except OSError:
+        pass  # só existe o parquet
+
+    try:
+        return pd.read_parquet(caminho_pq, engine="pyarrow", columns=colunas)
+    except Exception as exc:
+        logger.debug("Parquet ilegível (%s): %s", caminho_pq, exc)
+        return None
+
+
+def salvar_parquet_irmao(df: pd.DataFrame, caminho_csv, schema=None) -> None:
+    """
+    Grava `df` em .parquet (zstd) ao lado de `caminho_csv`.
+    `schema` (pyarrow.Schema) fixa os tipos das colunas no arquivo.
+    Falhas só são logadas: o CSV continua sendo a fonte de verdade.
+    """
+    caminho_pq = caminho_parquet(caminho_csv)
+    tmp = caminho_pq.with_suffix(".parquet.tmp")
+    try:
+        kwargs = {"schema": schema} if schema is not None else {}
+        df.to_parquet(tmp, compression="zstd", index=False, **kwargs)
+        os.replace(tmp, caminho_pq)
+    except Exception as exc:
+        logger.debug("Falha ao gravar parquet (%s): %s", caminho_pq, exc)
@@ -8,10 +8,20 @@ from datetime import datetime, timedelta, date
 from typing import Optional, List
 
 import pandas as pd
-import requests
 import logging
+
+from cache_disco import ler_parquet_irmao, salvar_parquet_irmao
+from sessao_http import criar_sessao
+
+try:
+    import pyarrow as pa  # schema fixo do .parquet do histórico
+except ImportError:
+    pa = None
 logging.basicConfig(level=logging.WARNING)
 
+# sessão única (keep-alive + pool) para os downloads da ANBIMA
+_HTTP = criar_sessao()
+
 
 # =============================================================================
 # CONFIGURAÇÃO DE PASTAS / ARQUIVOS
@@ -28,6 +38,21 @@ os.makedirs(BASE_DIR, exist_ok=True)
 # - TAXA_IPCA : juro real (% a.a.)
 PATH_FULL = os.path.join(BASE_DIR, "curvas_anbima_full.csv")
 
+# Schema do curvas_anbima_full.parquet (gravado junto com o CSV)
+SCHEMA_FULL = (
+    pa.schema(
+        [
+            ("data_curva", pa.date32()),
+            ("PRAZO_DU", pa.int64()),
+            ("TAXA_PREF", pa.float64()),
+            ("TAXA_IPCA", pa.float64()),
+            ("data_ref", pa.date32()),
+        ]
+    )
+    if pa is not None
+    else None
+)
+
 
 # =============================================================================
 # HELPERS INTERNOS
@@ -105,7 +130,7 @@ def _baixar_curva_zero_ultima() -> pd.DataFrame:
     _log(f"Baixando Curva Zero (última disponível) de {url}", level="debug")
 
     try:
-        resp = requests.get(url, headers=headers, timeout=30)
+        resp = _HTTP.get(url, headers=headers, timeout=30)
         resp.raise_for_status()
     except Exception as e:  # noqa: BLE001
         _log(f"Erro HTTP ao baixar Curva Zero: {e}")
@@ -207,6 +232,8 @@ def _append_historico_full(df_new: pd.DataFrame) -> None:
     # Garante tipos
     if "data_curva" in df_full.columns:
         df_full["data_curva"] = pd.to_datetime(df_full["data_curva"]).dt.date
+    if "data_ref" in df_full.columns:
+        df_full["data_ref"] = pd.to_datetime(df_full["data_ref"]).dt.date
 
     # Remove duplicatas por data_curva + PRAZO_DU
     if {"data_curva", "PRAZO_DU"}.issubset(df_full.columns):
@@ -217,6 +244,8 @@ def _append_historico_full(df_new: pd.DataFrame) -> None:
         )
 
     df_full.to_csv(PATH_FULL, index=False, encoding="utf-8-sig")
+    if SCHEMA_FULL is not None and set(SCHEMA_FULL.names) == set(df_full.columns):
+        salvar_parquet_irmao(df_full, PATH_FULL, schema=SCHEMA_FULL)
     _log(
         f"Histórico atualizado em {PATH_FULL} "
         f"({len(df_full)} linhas no total).", level="debug"
@@ -313,16 +342,22 @@ def _extrair_vertice_dia(
 
 
 def _carregar_historico_full() -> pd.DataFrame:
-    """Carrega o histórico completo de curvas, se existir."""
-    try:
-        df = pd.read_csv(PATH_FULL, parse_dates=["data_curva"])
-    except FileNotFoundError:
-        return pd.DataFrame()
+    """Carrega o histórico completo de curvas, se existir.
+
+    Prefere o .parquet gravado junto com o CSV (já tipado); cai no CSV
+    se o parquet não existir ou estiver desatualizado.
+    """
+    df = ler_parquet_irmao(PATH_FULL)
+    if df is None:
+        try:
+            df = pd.read_csv(PATH_FULL, parse_dates=["data_curva"])
+        except FileNotFoundError:
+            return pd.DataFrame()
 
     if df.empty:
         return df
 
-    df["data_curva"] = df["data_curva"].dt.date
+    df["data_curva"] = pd.to_datetime(df["data_curva"]).dt.date
     if "data_ref" in df.columns:
         df["data_ref"] = pd.to_datetime(df["data_ref"]).dt.date
     return df
@@ -1,14 +1,40 @@
 # dados_curto_prazo_br.py
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import pandas as pd
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Callable, NamedTuple
 from functools import lru_cache
 from dateutil.relativedelta import relativedelta
+
+from cache_disco import (
+    DIR_CACHE_HTTP,
+    CacheDisco,
+    caminho_parquet,
+    ler_ou_baixar,
+    ler_parquet_irmao,
+    salvar_parquet_irmao,
+)
+from sessao_http import criar_sessao, ler_json
+
+try:
+    import polars as pl  # leitor de CSV multithread (opcional)
+except ImportError:  # sem polars: cai no pandas puro
+    pl = None
+
+try:
+    import pyarrow as pa  # schema fixo dos caches em Parquet
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+
 def _to_float_scalar(val: Any) -> float:
     """
     Converte de forma segura um valor vindo de pandas para float nativo.
@@ -22,9 +48,14 @@ def _to_float_scalar(val: Any) -> float:
     return float(val)
 
 from di_futuro_b3 import (
+    HIST_PATH as CAMINHO_HIST_DI,  # di1_historico.csv
     baixar_snapshot_di_futuro,   # snapshot do dia
     carregar_historico_di_futuro # di1_historico.csv
 )  # DI Futuro B
+from ibovespa_ipea import (
+    HIST_PATH as CAMINHO_HIST_IBOV,  # ibovespa_ipea.csv
+    carregar_historico_ibovespa,
+)
 
 
 # Caminho para o CSV de curvas ANBIMA (já usado no bloco de Curvas)
@@ -39,12 +70,25 @@ CAMINHO_SGS_SELIC = SGS_DIR / "selic_meta_aa.csv"
 CAMINHO_SGS_CDI = SGS_DIR / "cdi_diario.csv"
 CAMINHO_SGS_PTAX = SGS_DIR / "ptax_venda.csv"
 
+# Cache em disco das respostas do SGS (sobrevive entre processos); mesmo
+# diretório e esquema de chaves do painel (indicadores_macro_br)
+SGS_CACHE_TTL_HOJE = 6 * 3600          # janela que termina hoje: 6h
+SGS_CACHE_TTL_FECHADA = 7 * 24 * 3600  # janela já fechada: 7 dias
+_CACHE_SGS = CacheDisco(DIR_CACHE_HTTP / "sgs")
+
+# Schema dos .parquet gravados ao lado dos CSVs de Selic/CDI/PTAX
+SCHEMA_SGS = (
+    pa.schema([("data", pa.timestamp("ns")), ("valor", pa.float64())])
+    if pa is not None
+    else None
+)
+
 # =============================================================================
 # DATACLASSES – ESTRUTURA DE DADOS DO BLOCO CURTO PRAZO
 # =============================================================================
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MoedaJurosCurtoPrazo:
     # Selic / CDI / PTAX – cards principais
     selic_meta: Optional[float]
@@ -73,7 +117,7 @@ class MoedaJurosCurtoPrazo:
     ptax_var_24m: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AtivosDomesticosCurtoPrazo:
     ibov_nivel: float
     ibov_var_dia: float
@@ -104,7 +148,7 @@ class AtivosDomesticosCurtoPrazo:
     di_5_anos_fonte_delta: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DadosCurtoPrazoBR:
     moeda_juros: MoedaJurosCurtoPrazo
     ativos_domesticos: AtivosDomesticosCurtoPrazo
@@ -121,22 +165,60 @@ SGS_SERIES = {
 }
 
 
+# Sessão HTTP compartilhada para a API do BCB (SGS): keep-alive entre as
+# threads + retry curto (2x, backoff 0.3s) só para 502/503/504.
+_SGS_SESSION = criar_sessao()
+SGS_TIMEOUT = (3.05, 10)  # (conexão, leitura), em segundos
+
+
+@lru_cache(maxsize=8)
+def _data_str_anos_atras(ordinal_hoje: int, anos: int) -> str:
+    """
+    Data (dd/mm/aaaa) de `anos` anos antes do dia `ordinal_hoje`.
+
+    Cacheada pelo ordinal do dia: o relativedelta + strftime roda uma vez
+    por dia para cada janela, e todos os helpers abaixo usam a mesma
+    âncora de "hoje".
+    """
+    dt = date.fromordinal(ordinal_hoje) - relativedelta(years=anos)
+    return dt.strftime("%d/%m/%Y")
+
+
 def _hoje_str() -> str:
-    return date.today().strftime("%d/%m/%Y")
+    return _data_str_anos_atras(date.today().toordinal(), 0)
 
 
 def _um_ano_atras_str() -> str:
-    dt = date.today() - relativedelta(years=1)
-    return dt.strftime("%d/%m/%Y")
+    return _data_str_anos_atras(date.today().toordinal(), 1)
 
 
 def _dois_anos_atras_str() -> str:
-    dt = date.today() - relativedelta(years=2)
-    return dt.strftime("%d/%m/%Y")
+    return _data_str_anos_atras(date.today().toordinal(), 2)
+
 
 def _quatro_anos_atras_str() -> str:
-    dt = date.today() - relativedelta(years=4)
-    return dt.strftime("%d/%m/%Y")
+    return _data_str_anos_atras(date.today().toordinal(), 4)
+
+
+def _chave_disco_sgs(
+    codigo: int,
+    data_inicial: Optional[str],
+    data_final: Optional[str],
+) -> str:
+    """
+    Chave do cache em disco de uma série SGS. Janela que termina hoje (o
+    caso do painel) vira "{codigo}_{dias}d", sem as datas: é o mesmo
+    arquivo de um dia para o outro, renovado pelo TTL, em vez de um
+    parquet novo por dia em data/.cache. Janela com datas fixas continua
+    com as datas na chave.
+    """
+    if data_inicial and data_final == _hoje_str():
+        dias = (
+            datetime.strptime(data_final, "%d/%m/%Y")
+            - datetime.strptime(data_inicial, "%d/%m/%Y")
+        ).days
+        return f"{codigo}_{dias}d"
+    return f"{codigo}_{data_inicial}_{data_final}"
 
 
 @lru_cache(maxsize=32)
@@ -148,26 +230,79 @@ def _buscar_serie_sgs_cached(
     """
     Versão simplificada de busca na API do BCB (SGS), com cache em memória.
     Retorna DataFrame com colunas: data (datetime64) e valor (float).
+
+    O DataFrame devolvido é somente leitura (arrays com write=False), pois
+    é o mesmo objeto guardado no lru_cache.
+
+    Antes da API, consulta o cache em disco (data/.cache/sgs, via
+    ler_ou_baixar): janelas que terminam hoje valem por SGS_CACHE_TTL_HOJE;
+    janelas fechadas, por SGS_CACHE_TTL_FECHADA. Se a API falhar, usa o
+    último arquivo salvo.
     """
+    ttl = (
+        SGS_CACHE_TTL_HOJE if data_final == _hoje_str() else SGS_CACHE_TTL_FECHADA
+    )
+    df = ler_ou_baixar(
+        _CACHE_SGS,
+        _chave_disco_sgs(codigo, data_inicial, data_final),
+        ttl,
+        _baixar_serie_sgs_bcb,
+        codigo,
+        data_inicial,
+        data_final,
+    )
+    return _df_somente_leitura(df)
+
+
+def _baixar_serie_sgs_bcb(
+    codigo: int,
+    data_inicial: str,
+    data_final: str,
+) -> pd.DataFrame:
+    """Baixa a série do SGS no intervalo e devolve ['data', 'valor']."""
     url = (
         f"https://api.bcb.gov.br/dados/serie/bcdata.sgs.{codigo}/dados"
         f"?formato=json&dataInicial={data_inicial}&dataFinal={data_final}"
     )
-    resp = requests.get(url, timeout=10)
+    resp = _SGS_SESSION.get(url, timeout=SGS_TIMEOUT)
     resp.raise_for_status()
-    dados = resp.json()
+    dados = ler_json(resp)
 
     if not dados:
         return pd.DataFrame(columns=["data", "valor"])
 
-    df = pd.DataFrame(dados)
-    df["data"] = pd.to_datetime(df["data"], format="%d/%m/%Y")
-    df["valor"] = pd.to_numeric(
-        df["valor"].astype(str).str.replace(",", "."),
-        errors="coerce",
-    )
-    df = df.sort_values("data").reset_index(drop=True)
-    return df
+    # preenche direto dois ndarrays tipados (uma passada na lista de dicts);
+    # data vem como dd/mm/aaaa e valor como texto, às vezes com vírgula
+    n = len(dados)
+    datas = np.empty(n, dtype="datetime64[D]")
+    valores = np.empty(n, dtype=np.float64)
+    for i, item in enumerate(dados):
+        d = item["data"]
+        datas[i] = np.datetime64(f"{d[6:10]}-{d[3:5]}-{d[0:2]}")
+        try:
+            valores[i] = float(str(item["valor"]).replace(",", "."))
+        except ValueError:
+            valores[i] = np.nan
+
+    df = pd.DataFrame({"data": datas.astype("datetime64[ns]"), "valor": valores})
+    return df.sort_values("data").reset_index(drop=True)
+
+
+def _df_somente_leitura(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reconstrói o DataFrame sobre arrays numpy marcados como não graváveis.
+
+    Assim o objeto cacheado pode ser devolvido direto, sem .copy(): qualquer
+    escrita in-place (df.loc[...] = x) levanta ValueError em vez de
+    corromper o cache. Operações que geram novo DataFrame (sort_values,
+    filtros, etc.) continuam funcionando normalmente.
+    """
+    colunas = {}
+    for col in df.columns:
+        arr = df[col].to_numpy()
+        arr.setflags(write=False)
+        colunas[col] = arr
+    return pd.DataFrame(colunas, index=df.index, copy=False)
 
 
 def buscar_serie_sgs(
@@ -175,11 +310,172 @@ def buscar_serie_sgs(
     data_inicial: Optional[str] = None,
     data_final: Optional[str] = None,
 ) -> pd.DataFrame:
+    """
+    Busca uma série do SGS (com cache em memória).
+
+    ATENÇÃO: o retorno é o próprio objeto do cache e é IMUTÁVEL
+    (arrays somente leitura). Quem precisar alterar os dados in-place
+    deve chamar .copy() antes.
+    """
     if data_inicial is None:
         data_inicial = _um_ano_atras_str()
     if data_final is None:
         data_final = _hoje_str()
-    return _buscar_serie_sgs_cached(codigo, data_inicial, data_final).copy()
+    return _buscar_serie_sgs_cached(codigo, data_inicial, data_final)
+
+
+# Janela padrão de cada série: (função de data inicial, função de data final)
+_SGS_DEFAULTS = {
+    "selic_meta_aa": (_um_ano_atras_str, _hoje_str),
+    "cdi_diario": (_um_ano_atras_str, _hoje_str),
+    "ptax_venda": (_dois_anos_atras_str, _hoje_str),
+}
+
+
+def buscar_sgs(
+    serie: str,
+    data_inicial: Optional[str] = None,
+    data_final: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Busca uma das séries de SGS_SERIES pelo nome ("selic_meta_aa",
+    "cdi_diario", "ptax_venda"), aplicando a janela padrão de
+    _SGS_DEFAULTS quando as datas não forem passadas.
+
+    Mesmo contrato de buscar_serie_sgs: o retorno é imutável.
+    """
+    inicio_padrao, fim_padrao = _SGS_DEFAULTS[serie]
+    if data_inicial is None:
+        data_inicial = inicio_padrao()
+    if data_final is None:
+        data_final = fim_padrao()
+    return _buscar_serie_sgs_cached(SGS_SERIES[serie], data_inicial, data_final)
+
+
+def _ler_csv_sgs(caminho: Path) -> pd.DataFrame:
+    """
+    Lê um dos CSVs de cache do SGS (colunas data, valor) já com os tipos
+    declarados: sem inferência de dtype e com a data parseada na leitura.
+    """
+    return pd.read_csv(
+        caminho,
+        dtype={"valor": "float64"},
+        parse_dates=["data"],
+        date_format="%Y-%m-%d",
+        engine="c",
+    )
+
+
+def _carregar_cache_sgs(caminho: Path) -> pd.DataFrame:
+    """
+    Lê o cache local de uma série SGS: prefere o .parquet gravado ao lado
+    do CSV (leitura colunar, sem tokenizar texto) e cai no CSV se o
+    parquet não existir ou estiver desatualizado.
+
+    Memorizado pela assinatura (mtime) dos arquivos: os refreshes do app
+    entre duas rodadas do updater não releem nada. O DataFrame devolvido
+    é somente leitura (ver _df_somente_leitura).
+    """
+    return _carregar_cache_sgs_cached(caminho, _assinatura_arquivo(caminho))
+
+
+@lru_cache(maxsize=8)
+def _carregar_cache_sgs_cached(
+    caminho: Path,
+    assinatura: Tuple[int, int],
+) -> pd.DataFrame:
+    df = ler_parquet_irmao(caminho)
+    if df is None:
+        df = _ler_csv_sgs(caminho)
+    return _df_somente_leitura(df)
+
+
+def _float_ou_none(valor: Any) -> Optional[float]:
+    """Escalar numpy/pandas -> float nativo (None continua None)."""
+    return float(valor) if valor is not None else None
+
+
+def _cdi_acumulados(
+    valores: np.ndarray,
+    i_mes: int,
+    i_ano: int,
+    i_12m: int,
+) -> Tuple[float, float, float]:
+    """
+    Acumulado (%) do CDI nas linhas i_mes..fim, i_ano..fim e i_12m..fim,
+    dadas as taxas diárias (%). Uma soma acumulada de log(1 + taxa/100)
+    serve as três janelas: o acumulado de [i, fim] é
+    expm1(cum[-1] - cum[i]). NaN conta como 0% (como o .prod() do pandas,
+    que pula NaN).
+    """
+    logs = np.log1p(np.nan_to_num(valores, nan=0.0) / 100.0)
+    cum = np.concatenate(([0.0], np.cumsum(logs)))
+    inicios = np.array([i_mes, i_ano, i_12m])
+    acumulados = np.expm1(cum[-1] - cum[inicios]) * 100.0
+    return (
+        float(acumulados[0]),
+        float(acumulados[1]),
+        float(acumulados[2]),
+    )
+
+
+def _ensure_sgs(
+    serie: str,
+    caminho: Path,
+    data_inicial: Optional[str] = None,
+    data_final: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Ponto único de decisão "arquivo local x API" para uma série SGS:
+    usa o cache local (parquet > CSV) se existir; senão busca na API
+    (buscar_sgs, que já passa pelo cache em disco e pelo lru_cache).
+
+    Se só existir o parquet e ele estiver ilegível, não há CSV para cair:
+    segue para a API, como quando não há arquivo local nenhum.
+    """
+    if caminho.exists() or caminho_parquet(caminho).exists():
+        try:
+            return _carregar_cache_sgs(caminho)
+        except FileNotFoundError:
+            pass
+    return buscar_sgs(serie, data_inicial, data_final)
+
+
+def _executar_em_paralelo(
+    tarefas: Dict[str, Tuple[Callable[..., Any], tuple]],
+) -> Dict[str, Any]:
+    """
+    Roda cada tarefa (função, args) numa thread própria, para que as
+    leituras/downloads independentes não fiquem em fila: o tempo total
+    vira o da tarefa mais lenta. As funções daqui passam quase todo o
+    tempo em I/O (requests, leitura de arquivo), que solta o GIL.
+
+    Retorna nome -> resultado, ou a exceção daquela tarefa, para que o
+    chamador caia nos defaults só do bloco que falhou.
+    """
+    if not tarefas:
+        return {}
+
+    resultados: Dict[str, Any] = {}
+    with ThreadPoolExecutor(max_workers=len(tarefas)) as pool:
+        futuros = {
+            nome: pool.submit(func, *args)
+            for nome, (func, args) in tarefas.items()
+        }
+        for nome, futuro in futuros.items():
+            try:
+                resultados[nome] = futuro.result()
+            except Exception as exc:
+                resultados[nome] = exc
+    return resultados
+
+
+def _resultado(resultados: Dict[str, Any], nome: str) -> Any:
+    """Devolve o resultado da tarefa ou relança a exceção guardada."""
+    resultado = resultados[nome]
+    if isinstance(resultado, Exception):
+        raise resultado
+    return resultado
 
 
 def buscar_selic_meta_aa(
@@ -195,11 +491,7 @@ def buscar_selic_meta_aa(
     O comportamento "offline-first" para o SITE fica em
     carregar_dados_curto_prazo_br(), que lê os CSVs em data/curto_prazo.
     """
-    return buscar_serie_sgs(
-        SGS_SERIES["selic_meta_aa"],
-        data_inicial=data_inicial,
-        data_final=data_final,
-    )
+    return buscar_sgs("selic_meta_aa", data_inicial, data_final)
 
 
 def buscar_cdi_diario(
@@ -211,11 +503,7 @@ def buscar_cdi_diario(
 
     Também é usado pelos scripts de atualização de cache.
     """
-    return buscar_serie_sgs(
-        SGS_SERIES["cdi_diario"],
-        data_inicial=data_inicial,
-        data_final=data_final,
-    )
+    return buscar_sgs("cdi_diario", data_inicial, data_final)
 
 
 def buscar_ptax_venda(
@@ -227,84 +515,99 @@ def buscar_ptax_venda(
 
     Por padrão, usamos os últimos 2 anos se datas não forem passadas.
     """
-    if data_inicial is None:
-        data_inicial = _dois_anos_atras_str()
-    if data_final is None:
-        data_final = _hoje_str()
+    return buscar_sgs("ptax_venda", data_inicial, data_final)
+
 
-    return buscar_serie_sgs(
-        SGS_SERIES["ptax_venda"],
-        data_inicial=data_inicial,
-        data_final=data_final,
-    )
 
+def _corte_anos(data_ref: pd.Timestamp, anos: int) -> pd.Timestamp:
+    """
+    Mesmo dia/mês `anos` anos antes de `data_ref` (29/02 vira 28/02),
+    igual a `data_ref - relativedelta(years=anos)`, mas sem o custo do
+    relativedelta (puro Python) nos caminhos chamados a cada render.
+    """
+    try:
+        return data_ref.replace(year=data_ref.year - anos)
+    except ValueError:
+        return data_ref.replace(year=data_ref.year - anos, day=28)
 
 
-def resumo_cambio(df: pd.DataFrame) -> Dict[str, Optional[float]]:
+def _ensure_sorted(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ordena por "data" só se precisar: as séries do SGS/cache já vêm
+    ordenadas, e a checagem de monotonicidade (O(n)) evita o sort + cópia.
+    """
+    if df["data"].is_monotonic_increasing:
+        return df
+    return df.sort_values("data").reset_index(drop=True)
+
+
+def _indice_corte(datas: np.ndarray, corte) -> int:
+    """
+    Primeira posição com data >= `corte` num array de datas JÁ ORDENADO.
+
+    Substitui o filtro df[df["data"] >= corte] por uma busca binária:
+    df.iloc[_indice_corte(...):] é uma fatia, sem montar máscara booleana.
+    """
+    return int(np.searchsorted(datas, np.datetime64(corte), side="left"))
+
+
+class ResumoCambio(NamedTuple):
+    """Resumo de um câmbio (PTAX): nível atual, bases e variações (%)."""
+
+    ultimo: Optional[float] = None
+    ultima_data: Optional[pd.Timestamp] = None
+    valor_12m: Optional[float] = None
+    data_12m: Optional[pd.Timestamp] = None
+    valor_24m: Optional[float] = None
+    data_24m: Optional[pd.Timestamp] = None
+    var_ano: Optional[float] = None
+    var_12m: Optional[float] = None
+    var_24m: Optional[float] = None
+
+
+# resumo de série vazia: tupla imutável, pode ser compartilhada
+_RESUMO_CAMBIO_VAZIO = ResumoCambio()
+
+
+def resumo_cambio(df: pd.DataFrame) -> ResumoCambio:
     """
     - último nível
     - variação no ano
     - nível e variação em 12m / 24m
+
+    Uma única passada sobre os arrays (datas/valores) já ordenados: as bases
+    saem de buscas binárias, sem montar sub-DataFrames.
     """
     if df.empty:
-        return {
-            "ultimo": None,
-            "ultima_data": None,
-            "valor_12m": None,
-            "data_12m": None,
-            "valor_24m": None,
-            "data_24m": None,
-            "var_ano": None,
-            "var_12m": None,
-            "var_24m": None,
-        }
-
-    df = df.sort_values("data").reset_index(drop=True)
-    ult = df.iloc[-1]
-    ultima_data = ult["data"]
-    ultimo_valor = ult["valor"]
-
-    ano_ref = ultima_data.year
-    df_ano = df[df["data"].dt.year == ano_ref]
-    if not df_ano.empty:
-        inicio_ano = df_ano.iloc[0]["valor"]
-        var_ano = (ultimo_valor / inicio_ano - 1) * 100.0
-    else:
-        var_ano = None
-
-    corte_12m = ultima_data - relativedelta(years=1)
-    df_12m = df[df["data"] >= corte_12m]
-    if not df_12m.empty:
-        valor_12m = df_12m.iloc[0]["valor"]
-        data_12m = df_12m.iloc[0]["data"]
-        var_12m = (ultimo_valor / valor_12m - 1) * 100.0
-    else:
-        valor_12m = None
-        data_12m = None
-        var_12m = None
-
-    corte_24m = ultima_data - relativedelta(years=2)
-    df_24m = df[df["data"] >= corte_24m]
-    if not df_24m.empty:
-        valor_24m = df_24m.iloc[0]["valor"]
-        data_24m = df_24m.iloc[0]["data"]
-        var_24m = (ultimo_valor / valor_24m - 1) * 100.0
-    else:
-        valor_24m = None
-        data_24m = None
-        var_24m = None
-
-    return {
-        "ultimo": float(ultimo_valor),
-        "ultima_data": ultima_data,
-        "valor_12m": float(valor_12m) if valor_12m is not None else None,
-        "data_12m": data_12m,
-        "valor_24m": float(valor_24m) if valor_24m is not None else None,
-        "data_24m": data_24m,
-        "var_ano": float(var_ano) if var_ano is not None else None,
-        "var_12m": float(var_12m) if var_12m is not None else None,
-        "var_24m": float(var_24m) if var_24m is not None else None,
-    }
+        return _RESUMO_CAMBIO_VAZIO
+
+    df = _ensure_sorted(df)
+    datas = df["data"].to_numpy()
+    valores = df["valor"].to_numpy(dtype=np.float64)
+
+    ultima_data = pd.Timestamp(datas[-1])
+    ultimo_valor = valores[-1]
+
+    # a última observação sempre está dentro das três janelas,
+    # então os índices abaixo são sempre válidos
+    i_ano = _indice_corte(datas, date(ultima_data.year, 1, 1))
+    i_12m = _indice_corte(datas, _corte_anos(ultima_data, 1))
+    i_24m = _indice_corte(datas, _corte_anos(ultima_data, 2))
+
+    valor_12m = valores[i_12m]
+    valor_24m = valores[i_24m]
+
+    return ResumoCambio(
+        ultimo=float(ultimo_valor),
+        ultima_data=ultima_data,
+        valor_12m=float(valor_12m),
+        data_12m=pd.Timestamp(datas[i_12m]),
+        valor_24m=float(valor_24m),
+        data_24m=pd.Timestamp(datas[i_24m]),
+        var_ano=float((ultimo_valor / valores[i_ano] - 1) * 100.0),
+        var_12m=float((ultimo_valor / valor_12m - 1) * 100.0),
+        var_24m=float((ultimo_valor / valor_24m - 1) * 100.0),
+    )
 
 
 # =============================================================================
@@ -312,45 +615,172 @@ def resumo_cambio(df: pd.DataFrame) -> Dict[str, Optional[float]]:
 # =============================================================================
 
 
-def _carregar_curvas_anbima_full() -> Optional[pd.DataFrame]:
-    if not CAMINHO_CURVAS_ANBIMA.exists():
+COLUNAS_CURVA_ANBIMA = ["data_curva", "PRAZO_DU", "TAXA_PREF"]
+
+# Tipos declarados para o leitor de CSV do pyarrow (sem inferência)
+SCHEMA_CURVA_ANBIMA = (
+    pa.schema(
+        [
+            ("data_curva", pa.timestamp("ns")),
+            ("PRAZO_DU", pa.int32()),
+            ("TAXA_PREF", pa.float64()),
+        ]
+    )
+    if pa is not None
+    else None
+)
+
+
+def _ler_curva_anbima_parquet() -> Optional[pd.DataFrame]:
+    """Parquet gravado pelo curvas_anbima.py (leitura colunar)."""
+    df = ler_parquet_irmao(CAMINHO_CURVAS_ANBIMA, colunas=COLUNAS_CURVA_ANBIMA)
+    if df is not None:
+        df["data_curva"] = pd.to_datetime(df["data_curva"])
+    return df
+
+
+def _ler_curva_anbima_polars() -> Optional[pd.DataFrame]:
+    """
+    Lê a curva ANBIMA mais recente com o scan "lazy" do polars: projeção
+    só das colunas usadas e filtro da data máxima empurrado para o scan,
+    então só as linhas do último dia são materializadas. Devolve None se
+    o polars não estiver disponível ou se a leitura falhar.
+    """
+    if pl is None:
+        return None
+
+    try:
+        df_pl = (
+            pl.scan_csv(CAMINHO_CURVAS_ANBIMA, try_parse_dates=True)
+            .select(COLUNAS_CURVA_ANBIMA)
+            .filter(pl.col("data_curva") == pl.col("data_curva").max())
+            # data_curva como timestamp (e não date) para manter o mesmo
+            # contrato do caminho pandas (.max() -> Timestamp)
+            .with_columns(pl.col("data_curva").cast(pl.Datetime("ns")))
+            .collect()
+        )
+        return df_pl.to_pandas(use_pyarrow_extension_array=True)
+    except Exception:
+        return None
+
+
+def _ler_curva_anbima_pyarrow() -> Optional[pd.DataFrame]:
+    """
+    CSV via leitor multithread do pyarrow, com schema declarado
+    (SCHEMA_CURVA_ANBIMA) e só as colunas usadas.
+    """
+    if pacsv is None:
         return None
 
     try:
-        df = pd.read_csv(CAMINHO_CURVAS_ANBIMA)
+        tabela = pacsv.read_csv(
+            str(CAMINHO_CURVAS_ANBIMA),
+            convert_options=pacsv.ConvertOptions(
+                column_types=SCHEMA_CURVA_ANBIMA,
+                include_columns=SCHEMA_CURVA_ANBIMA.names,
+            ),
+        )
+        return tabela.to_pandas(self_destruct=True)
     except Exception:
         return None
 
-    cols_minimas = {"data_curva", "PRAZO_DU", "TAXA_PREF"}
-    if not cols_minimas.issubset(df.columns):
+
+def _ler_curva_anbima_pandas() -> Optional[pd.DataFrame]:
+    """Último recurso: pandas (engine C), só com as colunas usadas."""
+    try:
+        return pd.read_csv(
+            CAMINHO_CURVAS_ANBIMA,
+            usecols=COLUNAS_CURVA_ANBIMA,
+            dtype={"PRAZO_DU": "int32", "TAXA_PREF": "float64"},
+            parse_dates=["data_curva"],
+            date_format="%Y-%m-%d",
+            engine="c",
+        )
+    except Exception:
         return None
 
-    df["data_curva"] = pd.to_datetime(df["data_curva"])
-    df = df.sort_values(["data_curva", "PRAZO_DU"])
-    return df
+
+def _carregar_curva_anbima_mais_recente() -> Optional[pd.DataFrame]:
+    """
+    Curva ANBIMA (data_curva, PRAZO_DU, TAXA_PREF) apenas da última
+    data_curva disponível, ordenada por PRAZO_DU.
+
+    Tenta os leitores do mais barato para o mais caro: parquet, polars
+    (scan lazy), pyarrow.csv e, por fim, pandas.
+    """
+    if not CAMINHO_CURVAS_ANBIMA.exists():
+        return None
+
+    for leitor in (
+        _ler_curva_anbima_parquet,
+        _ler_curva_anbima_polars,
+        _ler_curva_anbima_pyarrow,
+        _ler_curva_anbima_pandas,
+    ):
+        df = leitor()
+        if df is not None:
+            break
+    else:
+        return None
+
+    if df.empty:
+        return df
+
+    df = df[df["data_curva"] == df["data_curva"].max()]
+    return df.sort_values("PRAZO_DU")
+
+
+def _assinatura_arquivo(caminho) -> Tuple[int, int]:
+    """
+    (mtime_ns do CSV, mtime_ns do .parquet irmão), com 0 para o que não
+    existir. Serve de chave de cache: muda sempre que o updater regrava
+    o arquivo.
+    """
+    assinatura = []
+    for arq in (Path(caminho), caminho_parquet(caminho)):
+        try:
+            assinatura.append(arq.stat().st_mtime_ns)
+        except OSError:
+            assinatura.append(0)
+    return assinatura[0], assinatura[1]
 
 
 def _obter_taxas_pref_2e5_anos() -> Tuple[Optional[date], Optional[float], Optional[float]]:
-    df = _carregar_curvas_anbima_full()
-    if df is None or df.empty:
+    """
+    Taxas pré de 2 e 5 anos da última curva ANBIMA salva.
+
+    O arquivo só muda quando o updater roda, então o resultado fica
+    memorizado pela assinatura (mtime) do CSV/parquet.
+    """
+    return _obter_taxas_pref_2e5_anos_cached(
+        _assinatura_arquivo(CAMINHO_CURVAS_ANBIMA)
+    )
+
+
+@lru_cache(maxsize=4)
+def _obter_taxas_pref_2e5_anos_cached(
+    assinatura: Tuple[int, int],
+) -> Tuple[Optional[date], Optional[float], Optional[float]]:
+    df_ult = _carregar_curva_anbima_mais_recente()
+    if df_ult is None or df_ult.empty:
         return None, None, None
 
-    ultima_data = df["data_curva"].max()
-    df_ult = df[df["data_curva"] == ultima_data].copy()
+    ultima_data = df_ult["data_curva"].max()
 
     prazo_2a = 252 * 2
     prazo_5a = 252 * 5
 
-    taxa_2a = None
-    taxa_5a = None
-
-    linha_2a = df_ult.loc[df_ult["PRAZO_DU"] == prazo_2a]
-    if not linha_2a.empty:
-        taxa_2a = float(linha_2a["TAXA_PREF"].iloc[0])
+    # PRAZO_DU -> TAXA_PREF (invertido para que, se houver prazo repetido,
+    # vença a primeira linha, como no .loc[...].iloc[0] de antes)
+    taxa_por_prazo = dict(
+        zip(
+            df_ult["PRAZO_DU"].to_numpy()[::-1].tolist(),
+            df_ult["TAXA_PREF"].to_numpy()[::-1].tolist(),
+        )
+    )
 
-    linha_5a = df_ult.loc[df_ult["PRAZO_DU"] == prazo_5a]
-    if not linha_5a.empty:
-        taxa_5a = float(linha_5a["TAXA_PREF"].iloc[0])
+    taxa_2a = taxa_por_prazo.get(prazo_2a)
+    taxa_5a = taxa_por_prazo.get(prazo_5a)
 
     return ultima_data.date(), taxa_2a, taxa_5a
 
@@ -359,26 +789,35 @@ def _obter_taxas_pref_2e5_anos() -> Tuple[Optional[date], Optional[float], Optio
 # HELPERS – IBOVESPA E DI FUTURO
 # =============================================================================
 
-@lru_cache(maxsize=366)
-def _obter_serie_ibov(hoje_str: str) -> Optional[pd.Series]:
-    """Carrega a série histórica do Ibovespa a partir do CSV local.
+def _obter_serie_ibov() -> Optional[pd.Series]:
+    """Série histórica do Ibovespa (fechamentos) a partir do CSV local.
 
     100% off-line:
       - Lê sempre o CSV (carregar_historico_ibovespa)
       - Não faz nenhuma requisição on-line
+
+    É a fonte de _resumo_ibovespa (e, por ele, de _carregar_ibovespa_curto e
+    montar_resumo_ibovespa_tabela): a leitura/limpeza fica memorizada pela
+    assinatura (mtime) do CSV. A série devolvida já vem sem NaN, em float e
+    ordenada – não alterar in-place.
     """
-    try:
-        from ibovespa_ipea import carregar_historico_ibovespa
+    return _obter_serie_ibov_cached(_assinatura_arquivo(CAMINHO_HIST_IBOV))
+
 
+@lru_cache(maxsize=2)
+def _obter_serie_ibov_cached(assinatura: Tuple[int, int]) -> Optional[pd.Series]:
+    try:
         df_hist = carregar_historico_ibovespa()
         if df_hist is None or df_hist.empty:
             return None
 
-        df_hist = df_hist.copy()
-        df_hist["data"] = pd.to_datetime(df_hist["data"])
-        df_hist = df_hist.set_index("data").sort_index()
-
-        serie = df_hist["valor"].astype(float)
+        serie = pd.Series(
+            df_hist["valor"].to_numpy(dtype=float),
+            index=pd.DatetimeIndex(pd.to_datetime(df_hist["data"]), name="data"),
+            name="valor",
+        ).dropna()
+        if not serie.index.is_monotonic_increasing:
+            serie = serie.sort_index()
         if serie.empty:
             return None
 
@@ -387,53 +826,88 @@ def _obter_serie_ibov(hoje_str: str) -> Optional[pd.Series]:
         # Qualquer erro -> não derruba o app, só retorna None
         return None
 
-def _carregar_ibovespa_curto() -> Tuple[float, float, float, float]:
-    """Resumo do Ibovespa para o bloco de curto prazo (nível, dia, mês, ano).
+class ResumoIbovespa(NamedTuple):
+    """Último fechamento do Ibovespa e as bases de cada janela (pts)."""
 
-    Usa SOMENTE a série carregada do CSV local via _obter_serie_ibov.
+    ultimo: float
+    ultima_data: pd.Timestamp
+    base_dia: float  # fechamento anterior (= ultimo se só há um dia)
+    base_mes: float  # primeiro fechamento do mês
+    base_ano: float  # primeiro fechamento do ano
+    base_12m: float  # último fechamento <= data - 1 ano
+    base_24m: float  # último fechamento <= data - 2 anos
+
+
+def _variacao_pct(atual: float, base: float) -> float:
+    return (atual / base - 1.0) * 100.0 if base != 0 else 0.0
+
+
+def _resumo_ibovespa() -> Optional[ResumoIbovespa]:
     """
-    hoje = date.today()
-    chave_dia = hoje.strftime("%Y-%m-%d")
+    Resumo do Ibovespa calculado UMA vez por versão do CSV: tanto
+    _carregar_ibovespa_curto quanto montar_resumo_ibovespa_tabela só leem
+    campos daqui. None se não houver série.
+    """
+    return _resumo_ibovespa_cached(_assinatura_arquivo(CAMINHO_HIST_IBOV))
 
-    serie = _obter_serie_ibov(chave_dia)
+
+@lru_cache(maxsize=2)
+def _resumo_ibovespa_cached(assinatura: Tuple[int, int]) -> Optional[ResumoIbovespa]:
+    serie = _obter_serie_ibov_cached(assinatura)
     if serie is None or serie.empty:
-        return 0.0, 0.0, 0.0, 0.0
+        return None
 
-    serie = serie.dropna()
-    if serie.empty:
-        return 0.0, 0.0, 0.0, 0.0
+    # Série já ordenada: as bases saem por busca binária no array de datas,
+    # sem montar máscaras de ano/mês sobre a série inteira.
+    datas = serie.index.to_numpy()
+    valores = serie.to_numpy()
 
-    ultimo_dia = serie.index.max()
-    nivel_atual = float(serie.loc[ultimo_dia])
+    ultima_data = serie.index[-1]
+    ultimo = float(valores[-1])
 
-    # Variação no dia (vs último fechamento anterior)
-    serie_antes = serie[serie.index < ultimo_dia]
-    if serie_antes.empty:
-        var_dia_pct = 0.0
-    else:
-        nivel_anterior = float(serie_antes.iloc[-1])
-        var_dia_pct = (nivel_atual / nivel_anterior - 1.0) * 100.0
-
-    # Variação no mês
-    serie_mes = serie[
-        (serie.index.year == ultimo_dia.year)
-        & (serie.index.month == ultimo_dia.month)
-    ]
-    if serie_mes.empty:
-        var_mes_pct = 0.0
-    else:
-        nivel_inicio_mes = float(serie_mes.iloc[0])
-        var_mes_pct = (nivel_atual / nivel_inicio_mes - 1.0) * 100.0
+    # fechamento anterior ao último dia
+    i_dia = _indice_corte(datas, ultima_data)
+    base_dia = float(valores[i_dia - 1]) if i_dia > 0 else ultimo
 
-    # Variação no ano
-    serie_ano = serie[serie.index.year == ultimo_dia.year]
-    if serie_ano.empty:
-        var_ano_pct = 0.0
-    else:
-        nivel_inicio_ano = float(serie_ano.iloc[0])
-        var_ano_pct = (nivel_atual / nivel_inicio_ano - 1.0) * 100.0
+    # primeiro fechamento do mês / do ano (sempre existe: o próprio último dia)
+    base_mes = float(valores[_indice_corte(datas, ultima_data.replace(day=1))])
+    base_ano = float(
+        valores[_indice_corte(datas, ultima_data.replace(month=1, day=1))]
+    )
+
+    # último fechamento <= data de corte; sem histórico suficiente,
+    # a base é o próprio último fechamento (variação 0)
+    bases = []
+    for anos in (1, 2):
+        i = _indice_corte(datas, _corte_anos(ultima_data, anos) + pd.Timedelta(days=1)) - 1
+        bases.append(float(valores[i]) if i >= 0 else ultimo)
+
+    return ResumoIbovespa(
+        ultimo=ultimo,
+        ultima_data=ultima_data,
+        base_dia=base_dia,
+        base_mes=base_mes,
+        base_ano=base_ano,
+        base_12m=bases[0],
+        base_24m=bases[1],
+    )
 
-    return nivel_atual, var_dia_pct, var_mes_pct, var_ano_pct
+
+def _carregar_ibovespa_curto() -> Tuple[float, float, float, float]:
+    """Resumo do Ibovespa para o bloco de curto prazo (nível, dia, mês, ano).
+
+    Usa SOMENTE a série carregada do CSV local via _obter_serie_ibov.
+    """
+    resumo = _resumo_ibovespa()
+    if resumo is None:
+        return 0.0, 0.0, 0.0, 0.0
+
+    return (
+        resumo.ultimo,
+        _variacao_pct(resumo.ultimo, resumo.base_dia),
+        _variacao_pct(resumo.ultimo, resumo.base_mes),
+        _variacao_pct(resumo.ultimo, resumo.base_ano),
+    )
 
 
 def montar_resumo_ibovespa_tabela() -> pd.DataFrame:
@@ -447,74 +921,35 @@ def montar_resumo_ibovespa_tabela() -> pd.DataFrame:
       - "Nível atual (pts)"
       - "Variação (%)"
 
-    Usa a mesma série do helper _obter_serie_ibov, que por sua vez:
-      - tenta atualizar o CSV via Ipeadata;
+    Usa o mesmo resumo de _carregar_ibovespa_curto (_resumo_ibovespa), que:
       - lê sempre o histórico local (ibovespa_ipea.carregar_historico_ibovespa);
-      - cacheia por dia para não repetir trabalho.
+      - fica memorizado pelo mtime do CSV para não repetir trabalho.
     """
     try:
-        chave_dia = date.today().strftime("%Y-%m-%d")
-        serie = _obter_serie_ibov(chave_dia)
+        resumo = _resumo_ibovespa()
 
-        if serie is None or serie.empty:
+        if resumo is None:
             raise RuntimeError("Série de Ibovespa vazia.")
 
-        # Garante ordenação crescente por data
-        close = serie.sort_index()
-
-        # Nível atual (último fechamento)
-        ultimo_close = _to_float_scalar(close.iloc[-1])
-        data_ult = close.index[-1]
-
-        # ---------- No ano ----------
-        mask_ano = close.index.year == data_ult.year
-        serie_ano = close[mask_ano]
-        if not serie_ano.empty:
-            base_ano = _to_float_scalar(serie_ano.iloc[0])
-        else:
-            base_ano = ultimo_close
-        var_ano = (ultimo_close / base_ano - 1.0) * 100.0 if base_ano != 0 else 0.0
-
-        # ---------- Em 12 meses ----------
-        data_12m = data_ult - relativedelta(years=1)
-        serie_12m = close[close.index <= data_12m]
-        if not serie_12m.empty:
-            base_12m = _to_float_scalar(serie_12m.iloc[-1])
-        else:
-            base_12m = ultimo_close
-        var_12m = (ultimo_close / base_12m - 1.0) * 100.0 if base_12m != 0 else 0.0
-
-        # ---------- Em 24 meses ----------
-        data_24m = data_ult - relativedelta(years=2)
-        serie_24m = close[close.index <= data_24m]
-        if not serie_24m.empty:
-            base_24m = _to_float_scalar(serie_24m.iloc[-1])
-        else:
-            base_24m = ultimo_close
-        var_24m = (ultimo_close / base_24m - 1.0) * 100.0 if base_24m != 0 else 0.0
-
-        dados_tabela = [
-            {
-                "Período": "No ano",
-                "Nível base (pts)": base_ano,
-                "Nível atual (pts)": ultimo_close,
-                "Variação (%)": var_ano,
-            },
-            {
-                "Período": "Em 12 meses",
-                "Nível base (pts)": base_12m,
-                "Nível atual (pts)": ultimo_close,
-                "Variação (%)": var_12m,
-            },
-            {
-                "Período": "Em 24 meses",
-                "Nível base (pts)": base_24m,
-                "Nível atual (pts)": ultimo_close,
-                "Variação (%)": var_24m,
-            },
-        ]
+        ultimo_close = resumo.ultimo
+        bases = np.array(
+            [resumo.base_ano, resumo.base_12m, resumo.base_24m], dtype=np.float64
+        )
+
+        # Montado por colunas (arrays já tipados): o pandas não precisa
+        # inferir dtype linha a linha como no DataFrame(list de dicts).
+        # Base 0 -> variação 0 (mesma regra de _variacao_pct).
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variacoes = np.where(bases != 0, (ultimo_close / bases - 1.0) * 100.0, 0.0)
 
-        return pd.DataFrame(dados_tabela)
+        return pd.DataFrame(
+            {
+                "Período": ["No ano", "Em 12 meses", "Em 24 meses"],
+                "Nível base (pts)": bases,
+                "Nível atual (pts)": np.full(3, ultimo_close, dtype=np.float64),
+                "Variação (%)": variacoes,
+            }
+        )
 
     except Exception:
         # Em caso de erro, devolve DF vazio para não derrubar o app
@@ -528,6 +963,41 @@ def montar_resumo_ibovespa_tabela() -> pd.DataFrame:
         )
 
 
+# janela de vencimentos plausíveis para DI1 (descarta 9999-12-31 e afins)
+_VENC_DI_MIN = np.datetime64("2000-01-01")
+_VENC_DI_MAX = np.datetime64("2101-01-01")
+
+
+def _pick_di(
+    anos_arr: np.ndarray,
+    volumes_arr: np.ndarray,
+    alvo: float,
+    tol: float,
+) -> int:
+    """
+    Índice do contrato mais próximo de `alvo` (em anos), desempatando pelo
+    maior volume (argmin/argmax sobre os arrays, sem ordenar).
+
+    Considera só a janela |anos - alvo| <= tol; se ninguém cair na janela,
+    usa todos. Volume NaN perde qualquer desempate (como no sort do pandas).
+    Devolve -1 se o array estiver vazio.
+    """
+    if anos_arr.shape[0] == 0:
+        return -1
+
+    diffs = np.abs(anos_arr - alvo)
+    janela = diffs <= tol
+    if not janela.any():
+        janela = np.ones_like(janela)
+
+    # os mais próximos do alvo dentro da janela; entre eles, o de maior
+    # volume (argmax devolve o primeiro em caso de empate)
+    diff_min = diffs[janela].min()
+    empatados = np.flatnonzero(janela & (diffs == diff_min))
+    volumes = np.nan_to_num(volumes_arr[empatados], nan=-np.inf)
+    return int(empatados[np.argmax(volumes)])
+
+
 def _escolher_di_por_prazo(
     df: pd.DataFrame,
     anos_alvo: float,
@@ -547,42 +1017,34 @@ def _escolher_di_por_prazo(
 
     hoje = date.today()
 
-    df = df.copy()
-
     # converte vencimento para datetime, mas derruba datas absurdas (ex.: 9999-12-31)
     venc_dt = pd.to_datetime(df["vencimento"], errors="coerce")
 
-    # mantém só anos "plausíveis" para DI (ex.: entre 2000 e 2100)
-    mask_anos_ok = (venc_dt.dt.year >= 2000) & (venc_dt.dt.year <= 2100)
-    venc_dt = venc_dt.where(mask_anos_ok)
-
-    df["vencimento"] = venc_dt.dt.date
-    df = df.dropna(subset=["vencimento"])
-
-    df["dias_ate_venc"] = df["vencimento"].apply(
-        lambda d: (d - hoje).days if isinstance(d, date) else None
-    )
-    df = df.dropna(subset=["dias_ate_venc"])
-
-    # converte para anos usando ~252 dias úteis
-    df["anos_ate_venc"] = df["dias_ate_venc"].astype(float) / 252.0
-    df["diff_anos"] = (df["anos_ate_venc"] - float(anos_alvo)).abs()
-
-    # restringe à janela em torno do alvo; se não tiver, usa todos
-    df_janela = df[df["diff_anos"] <= tolerancia]
-    if df_janela.empty:
-        df_janela = df
-
-    # ordena pela proximidade do alvo e, se existir, por volume desc
-    sort_cols = ["diff_anos"]
-    ascending = [True]
-    if "volume" in df_janela.columns:
-        sort_cols.append("volume")
-        ascending.append(False)
+    # mantém só anos "plausíveis" para DI (ex.: entre 2000 e 2100): UMA
+    # máscara sobre o array datetime64, NaT cai fora sozinho. Nada de
+    # copiar/filtrar o DataFrame – a linha escolhida sai do df original
+    # via iloc nas posições válidas.
+    venc = venc_dt.to_numpy()
+    mask_anos_ok = (venc >= _VENC_DI_MIN) & (venc < _VENC_DI_MAX) & ~np.isnat(venc)
+    posicoes = np.flatnonzero(mask_anos_ok)
+
+    # dias corridos até o vencimento em timedelta64 (sem .apply por linha),
+    # convertidos para anos usando ~252 dias úteis
+    dias_ate_venc = venc[posicoes].astype("datetime64[D]") - np.datetime64(hoje, "D")
+    anos_arr = dias_ate_venc.astype(np.float64) / 252.0
+    if "volume" in df.columns:
+        volumes_arr = pd.to_numeric(df["volume"], errors="coerce").to_numpy(
+            dtype=np.float64
+        )[posicoes]
+    else:
+        volumes_arr = np.zeros(len(posicoes), dtype=np.float64)
 
-    df_janela = df_janela.sort_values(sort_cols, ascending=ascending)
+    # argmin (com desempate por volume) em vez de sort_values
+    idx = _pick_di(anos_arr, volumes_arr, float(anos_alvo), float(tolerancia))
+    if idx < 0:
+        return None, None, None
 
-    linha = df_janela.iloc[0]
+    linha = df.iloc[posicoes[idx]]
 
     taxa_raw = linha.get("taxa")
     variacao_bps_raw = linha.get("variacao_bps")
@@ -602,27 +1064,25 @@ def _escolher_di_por_prazo(
 
 
 def _delta_di_vs_d1(
-    df_hist: pd.DataFrame,
+    taxas_por_ticker: Dict[str, np.ndarray],
     ticker: Optional[str],
     taxa_atual: Optional[float],
 ) -> Optional[float]:
     """
     Calcula o delta em p.p. vs D-1 a partir do histórico di1_historico.csv
     para um determinado ticker.
-    """
-    if df_hist is None or df_hist.empty or ticker is None or taxa_atual is None:
-        return None
 
-    df_tk = df_hist[df_hist["ticker"] == ticker].copy()
-    if df_tk.empty:
+    `taxas_por_ticker` é o histórico já agrupado por _agrupar_taxas_por_ticker
+    (ticker -> taxas ordenadas por data): a consulta é um get no dict.
+    """
+    if not taxas_por_ticker or ticker is None or taxa_atual is None:
         return None
 
-    df_tk = df_tk.sort_values("data")
-
-    if len(df_tk) < 2:
+    taxas_tk = taxas_por_ticker.get(ticker)
+    if taxas_tk is None or len(taxas_tk) < 2:
         return None
 
-    taxa_d1_raw = df_tk["taxa"].iloc[-2]
+    taxa_d1_raw = taxas_tk[-2]
     try:
         taxa_d1 = float(taxa_d1_raw)
     except Exception:
@@ -643,23 +1103,24 @@ def _delta_di_vs_inicio_ano(
     if df_hist is None or df_hist.empty or ticker is None or taxa_atual is None:
         return None
 
-    df_tk = df_hist[df_hist["ticker"] == ticker].copy()
+    df_tk = df_hist[df_hist["ticker"] == ticker]
     if df_tk.empty:
         return None
 
-    # garante ordenação por data
-    df_tk = df_tk.sort_values("data")
-
-    # converte para datetime para filtrar por ano
-    df_tk["data_dt"] = pd.to_datetime(df_tk["data"])
+    # data_dt (datetime64) já vem pronta de _carregar_historico_di_preparado;
+    # só reconverte se alguém passar o histórico "cru"
+    if "data_dt" in df_tk.columns:
+        data_dt = df_tk["data_dt"]
+    else:
+        data_dt = pd.to_datetime(df_tk["data"])
     ano_ref = datetime.today().year
 
-    df_ano = df_tk[df_tk["data_dt"].dt.year == ano_ref]
+    df_ano = df_tk[data_dt.dt.year.to_numpy() == ano_ref]
     if df_ano.empty:
         return None
 
     # primeira taxa do ano para esse ticker
-    taxa_ini_raw = df_ano.sort_values("data_dt")["taxa"].iloc[0]
+    taxa_ini_raw = df_ano.sort_values("data")["taxa"].iloc[0]
     try:
         taxa_ini = float(taxa_ini_raw)
     except Exception:
@@ -669,7 +1130,87 @@ def _delta_di_vs_inicio_ano(
     return taxa_atual - taxa_ini
 
 
-def _carregar_di_futuro_2e5_anos() -> Tuple[
+def _carregar_historico_di_preparado() -> Optional[pd.DataFrame]:
+    """
+    Lê o di1_historico.csv UMA vez e já deixa a coluna auxiliar
+    `data_dt` (datetime64) pronta, para os cálculos de delta não
+    precisarem reconverter a coluna `data` a cada chamada.
+
+    Memorizado pela assinatura (mtime) do arquivo: só relê quando o
+    histórico for regravado. O DataFrame devolvido é compartilhado –
+    não alterar in-place.
+    """
+    return _carregar_historico_di_cached(_assinatura_arquivo(CAMINHO_HIST_DI))
+
+
+@lru_cache(maxsize=2)
+def _carregar_historico_di_cached(
+    assinatura: Tuple[int, int],
+) -> Optional[pd.DataFrame]:
+    try:
+        df_hist = carregar_historico_di_futuro()
+    except Exception:
+        return None
+
+    if df_hist is None or df_hist.empty:
+        return df_hist
+
+    df_hist["data_dt"] = pd.to_datetime(df_hist["data"])
+    return df_hist
+
+
+def _agrupar_taxas_por_ticker(df_hist: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    {ticker: array de taxas ordenado por data}, montado com UM sort
+    (ticker, data) e cortes nas fronteiras de ticker – no lugar de filtrar
+    o histórico inteiro por ticker a cada consulta.
+    """
+    df_ord = df_hist.sort_values(["ticker", "data"], kind="mergesort")
+    tickers = df_ord["ticker"].to_numpy()
+    taxas = df_ord["taxa"].to_numpy()
+
+    if len(tickers) == 0:
+        return {}
+
+    inicios = np.flatnonzero(tickers[1:] != tickers[:-1]) + 1
+    cortes = np.concatenate(([0], inicios, [len(tickers)]))
+    return {
+        tickers[ini]: taxas[ini:fim]
+        for ini, fim in zip(cortes[:-1], cortes[1:])
+    }
+
+
+@lru_cache(maxsize=2)
+def _taxas_di_por_ticker_cached(
+    assinatura: Tuple[int, int],
+) -> Dict[str, np.ndarray]:
+    df_hist = _carregar_historico_di_cached(assinatura)
+    if df_hist is None or df_hist.empty:
+        return {}
+    return _agrupar_taxas_por_ticker(df_hist)
+
+
+def _carregar_historico_di_agrupado() -> Tuple[
+    Optional[pd.DataFrame], Dict[str, np.ndarray]
+]:
+    """
+    Histórico preparado (_carregar_historico_di_preparado) + as taxas
+    agrupadas por ticker, os dois memorizados pela MESMA assinatura de
+    mtime: o agrupamento sai do cache junto com o DataFrame, sem reler o
+    CSV. Compartilhados – não alterar in-place.
+    """
+    assinatura = _assinatura_arquivo(CAMINHO_HIST_DI)
+    return (
+        _carregar_historico_di_cached(assinatura),
+        _taxas_di_por_ticker_cached(assinatura),
+    )
+
+
+def _carregar_di_futuro_2e5_anos(
+    df_hist: Optional[pd.DataFrame] = None,
+    df_snapshot: Optional[pd.DataFrame] = None,
+    taxas_por_ticker: Optional[Dict[str, np.ndarray]] = None,
+) -> Tuple[
     Optional[str],
     Optional[float],
     Optional[float],
@@ -688,6 +1229,12 @@ def _carregar_di_futuro_2e5_anos() -> Tuple[
       - Se o snapshot do dia falhar, usamos o ÚLTIMO DIA disponível no histórico
         para nível e delta (fonte = 'D-1').
 
+    Se `df_hist` for passado, reaproveita esse histórico em vez de ler o
+    CSV de novo. Idem para `df_snapshot` (snapshot já baixado; DataFrame
+    vazio = download falhou) e para `taxas_por_ticker` (o agrupamento de
+    _carregar_historico_di_agrupado); sem ele, o `df_hist` passado é
+    agrupado na hora.
+
     Retorna:
       (ticker_2a, di_2a_taxa, di_2a_delta, fonte_2,
        ticker_5a, di_5a_taxa, di_5a_delta, fonte_5)
@@ -702,10 +1249,12 @@ def _carregar_di_futuro_2e5_anos() -> Tuple[
     ticker_di5: Optional[str] = None
 
     # 1) Snapshot do dia (tenta intraday)
-    try:
-        df = baixar_snapshot_di_futuro()
-    except Exception:
-        df = None
+    df = df_snapshot
+    if df is None:
+        try:
+            df = baixar_snapshot_di_futuro()
+        except Exception:
+            df = None
 
     if df is not None and not df.empty:
         ticker_di2, di_2_taxa, di_2_delta_intr = _escolher_di_por_prazo(
@@ -724,22 +1273,25 @@ def _carregar_di_futuro_2e5_anos() -> Tuple[
             fonte_di5 = "intraday"
 
     # 2) Histórico (csv) – para delta D-1 e fallback de nível
-    try:
-        df_hist = carregar_historico_di_futuro()
-    except Exception:
-        df_hist = None
+    if df_hist is None:
+        df_hist, taxas_por_ticker = _carregar_historico_di_agrupado()
 
     if df_hist is not None and not df_hist.empty:
+        # taxas por ticker (ordenadas por data) agrupadas UMA vez e
+        # compartilhadas por todas as consultas de D-1 abaixo
+        if taxas_por_ticker is None:
+            taxas_por_ticker = _agrupar_taxas_por_ticker(df_hist)
+
         # 2a) Se já temos taxa do snapshot, mas não temos delta intraday,
         #     calculamos delta vs D-1.
         if di_2_taxa is not None and (di_2_delta is None or fonte_di2 == "none"):
-            delta_d1 = _delta_di_vs_d1(df_hist, ticker_di2, di_2_taxa)
+            delta_d1 = _delta_di_vs_d1(taxas_por_ticker, ticker_di2, di_2_taxa)
             if delta_d1 is not None:
                 di_2_delta = delta_d1
                 fonte_di2 = "D-1"
 
         if di_5_taxa is not None and (di_5_delta is None or fonte_di5 == "none"):
-            delta_d1 = _delta_di_vs_d1(df_hist, ticker_di5, di_5_taxa)
+            delta_d1 = _delta_di_vs_d1(taxas_por_ticker, ticker_di5, di_5_taxa)
             if delta_d1 is not None:
                 di_5_delta = delta_d1
                 fonte_di5 = "D-1"
@@ -749,7 +1301,7 @@ def _carregar_di_futuro_2e5_anos() -> Tuple[
         if ticker_di2 is None or di_2_taxa is None or ticker_di5 is None or di_5_taxa is None:
             # último dia com dados
             ultima_data_hist = df_hist["data"].max()
-            df_ult = df_hist[df_hist["data"] == ultima_data_hist].copy()
+            df_ult = df_hist[df_hist["data"] == ultima_data_hist]
 
             # 2 anos
             if ticker_di2 is None or di_2_taxa is None:
@@ -760,7 +1312,7 @@ def _carregar_di_futuro_2e5_anos() -> Tuple[
                     di_2_taxa = taxa2
 
                 if di_2_taxa is not None and ticker_di2 is not None:
-                    delta_d1 = _delta_di_vs_d1(df_hist, ticker_di2, di_2_taxa)
+                    delta_d1 = _delta_di_vs_d1(taxas_por_ticker, ticker_di2, di_2_taxa)
                     if delta_d1 is not None:
                         di_2_delta = delta_d1
                         fonte_di2 = "D-1"
@@ -774,7 +1326,7 @@ def _carregar_di_futuro_2e5_anos() -> Tuple[
                     di_5_taxa = taxa5
 
                 if di_5_taxa is not None and ticker_di5 is not None:
-                    delta_d1 = _delta_di_vs_d1(df_hist, ticker_di5, di_5_taxa)
+                    delta_d1 = _delta_di_vs_d1(taxas_por_ticker, ticker_di5, di_5_taxa)
                     if delta_d1 is not None:
                         di_5_delta = delta_d1
                         fonte_di5 = "D-1"
@@ -791,9 +1343,26 @@ def _carregar_di_futuro_2e5_anos() -> Tuple[
         fonte_di5,
     )
 
+def _salvar_cache_sgs(df: pd.DataFrame, caminho: Path) -> None:
+    """
+    Grava uma série SGS no formato que _ler_csv_sgs espera: sempre as
+    colunas data,valor (nessa ordem), data ISO, sem índice e floats sem
+    cauda de repr; e o .parquet (schema fixo) ao lado.
+    """
+    df.to_csv(
+        caminho,
+        index=False,
+        columns=["data", "valor"],
+        date_format="%Y-%m-%d",
+        float_format="%.10g",
+    )
+    salvar_parquet_irmao(df[["data", "valor"]], caminho, schema=SCHEMA_SGS)
+
+
 def atualizar_cache_curto_prazo() -> None:
     """
-    Atualiza e salva em CSV as séries SGS usadas no bloco de curto prazo:
+    Atualiza e salva em CSV (+ .parquet ao lado) as séries SGS usadas no
+    bloco de curto prazo:
     - Selic Meta (% a.a.)  -> 4 anos de histórico (pra ter 12/24/36/48m)
     - CDI diário (% a.d.)  -> 2 anos de histórico
     - PTAX venda (R$/US$)  -> 2 anos de histórico
@@ -810,11 +1379,7 @@ def atualizar_cache_curto_prazo() -> None:
         data_final=hoje,
     )
     if not df_selic.empty:
-        df_selic.to_csv(
-            CAMINHO_SGS_SELIC,
-            index=False,
-            date_format="%Y-%m-%d",
-        )
+        _salvar_cache_sgs(df_selic, CAMINHO_SGS_SELIC)
 
     # ---------- CDI diário – 2 anos ----------
     df_cdi = buscar_cdi_diario(
@@ -822,22 +1387,17 @@ def atualizar_cache_curto_prazo() -> None:
         data_final=hoje,
     )
     if not df_cdi.empty:
-        df_cdi.to_csv(
-            CAMINHO_SGS_CDI,
-            index=False,
-            date_format="%Y-%m-%d",
-        )
+        _salvar_cache_sgs(df_cdi, CAMINHO_SGS_CDI)
 
     # ---------- PTAX venda – 2 anos ----------
     # aqui NÃO passamos data_inicial/data_final,
     # porque a própria função buscar_ptax_venda já cuida disso
     df_ptax = buscar_ptax_venda()
     if not df_ptax.empty:
-        df_ptax.to_csv(
-            CAMINHO_SGS_PTAX,
-            index=False,
-            date_format="%Y-%m-%d",
-        )
+        _salvar_cache_sgs(df_ptax, CAMINHO_SGS_PTAX)
+
+    # caches novos em disco -> descarta o resumo memorizado no processo
+    carregar_dados_curto_prazo_br.cache_clear()
 
 # =============================================================================
 # FUNÇÃO PRINCIPAL – CARREGA TUDO
@@ -852,6 +1412,26 @@ def carregar_dados_curto_prazo_br() -> DadosCurtoPrazoBR:
       • Selic, CDI e PTAX vêm de dados reais da API do BCB (SGS).
       • Ibovespa via histórico local (CSV do Ipeadata, atualizado automaticamente).
       • DI Futuro 2a / 5a via snapshot B3 (di_futuro_b3).
+
+    O resultado fica memorizado por minuto (_carregar_por_minuto): várias
+    chamadas no mesmo minuto devolvem a MESMA instância, sem reler
+    CSVs/APIs. Para forçar recarga: carregar_dados_curto_prazo_br.cache_clear().
+    """
+    return _carregar_por_minuto(int(time.time() // 60))
+
+
+@lru_cache(maxsize=4)
+def _carregar_por_minuto(minuto: int) -> DadosCurtoPrazoBR:
+    """Memo do carregamento, chaveado pelo minuto corrente (epoch // 60)."""
+    return _montar_dados_curto_prazo_br()
+
+
+carregar_dados_curto_prazo_br.cache_clear = _carregar_por_minuto.cache_clear
+
+
+def _montar_dados_curto_prazo_br() -> DadosCurtoPrazoBR:
+    """
+    Carregamento de fato (sem memo) – ver carregar_dados_curto_prazo_br().
     """
 
     # ---------------------
@@ -877,38 +1457,58 @@ def carregar_dados_curto_prazo_br() -> DadosCurtoPrazoBR:
     ptax_var_12m = None
     ptax_var_24m = None
 
+    # -------- LEITURAS INDEPENDENTES, em paralelo --------
+    # SGS (cache local ou API), Ibovespa, curva ANBIMA e DI (snapshot B3 +
+    # histórico) não dependem um do outro: disparam juntos e cada bloco
+    # abaixo só consome o resultado (ou cai nos defaults se falhou).
+    resultados = _executar_em_paralelo(
+        {
+            # Selic: se for para a API, pega 2 anos para conseguir 12m e 24m
+            "selic_meta_aa": (
+                _ensure_sgs,
+                ("selic_meta_aa", CAMINHO_SGS_SELIC, _dois_anos_atras_str(), _hoje_str()),
+            ),
+            "cdi_diario": (_ensure_sgs, ("cdi_diario", CAMINHO_SGS_CDI)),  # padrão ~1 ano
+            "ptax_venda": (_ensure_sgs, ("ptax_venda", CAMINHO_SGS_PTAX)),
+            "ibovespa": (_carregar_ibovespa_curto, ()),
+            "curva_anbima": (_obter_taxas_pref_2e5_anos, ()),
+            "di_snapshot": (baixar_snapshot_di_futuro, ()),
+            "di_historico": (_carregar_historico_di_agrupado, ()),
+        }
+    )
+
     # -------- SELIC META --------
     try:
-        # Pega 2 anos para conseguir 12m e 24m
-        if CAMINHO_SGS_SELIC.exists():
-            df_selic = pd.read_csv(CAMINHO_SGS_SELIC)
-            df_selic["data"] = pd.to_datetime(df_selic["data"])
-        else:
-            df_selic = buscar_selic_meta_aa(
-                data_inicial=_dois_anos_atras_str(),
-                data_final=_hoje_str(),
-            )
+        df_selic = _resultado(resultados, "selic_meta_aa")
 
         if not df_selic.empty:
-            df_selic = df_selic.sort_values("data").reset_index(drop=True)
-            selic_meta = float(df_selic["valor"].iloc[-1])
-
-            ultima_data = df_selic["data"].iloc[-1]
-            corte_12m = ultima_data - relativedelta(years=1)
-            corte_24m = ultima_data - relativedelta(years=2)
-
-            df_24m = df_selic[df_selic["data"] >= corte_24m]
-            df_12m = df_selic[df_selic["data"] >= corte_12m]
-
-            if not df_24m.empty:
-                selic_24m = float(df_24m["valor"].mean())
-            if not df_12m.empty:
-                selic_12m = float(df_12m["valor"].mean())
-
-            # "Última decisão" = último nível diferente do atual (aprox. pré-Copom)
-            df_antes = df_selic[df_selic["valor"] != selic_meta]
-            if not df_antes.empty:
-                selic_ultima_decisao = float(df_antes["valor"].iloc[-1])
+            df_selic = _ensure_sorted(df_selic)
+            # trabalha direto nos arrays das colunas (sem .iloc por linha)
+            datas_selic = df_selic["data"].to_numpy()
+            valores_selic = df_selic["valor"].to_numpy(dtype=np.float64)
+            selic_meta = valores_selic[-1]
+
+            ultima_data = pd.Timestamp(datas_selic[-1])
+            corte_12m = _corte_anos(ultima_data, 1)
+            corte_24m = _corte_anos(ultima_data, 2)
+
+            # médias 24m / 12m: fatias a partir de cada corte (busca binária)
+            serie_selic = df_selic["valor"]
+            i_24m = _indice_corte(datas_selic, corte_24m)
+            i_12m = _indice_corte(datas_selic, corte_12m)
+            if i_24m < len(serie_selic):
+                selic_24m = serie_selic.iloc[i_24m:].mean()
+            if i_12m < len(serie_selic):
+                selic_12m = serie_selic.iloc[i_12m:].mean()
+
+            # "Última decisão" = nível ANTES da última mudança da meta
+            # (aprox. pré-Copom). Com a série ordenada, a última mudança é
+            # o último k com niveis[k] != niveis[k + 1]. Os buracos (NaN)
+            # saem antes: NaN != x é sempre True e viraria "mudança".
+            niveis = valores_selic[~np.isnan(valores_selic)]
+            idx_mudancas = np.flatnonzero(niveis[1:] != niveis[:-1])
+            if idx_mudancas.size:
+                selic_ultima_decisao = niveis[idx_mudancas[-1]]
             else:
                 selic_ultima_decisao = selic_meta
     except Exception:
@@ -917,108 +1517,109 @@ def carregar_dados_curto_prazo_br() -> DadosCurtoPrazoBR:
 
     # -------- CDI DIÁRIO --------
     try:
-        if CAMINHO_SGS_CDI.exists():
-            df_cdi = pd.read_csv(CAMINHO_SGS_CDI)
-            df_cdi["data"] = pd.to_datetime(df_cdi["data"])
-        else:
-            df_cdi = buscar_cdi_diario()  # por padrão usa ~1 ano
+        df_cdi = _resultado(resultados, "cdi_diario")
 
         if not df_cdi.empty:
-            df_cdi = df_cdi.sort_values("data").reset_index(drop=True)
-            ult = df_cdi.iloc[-1]
-            cdi_dia = float(ult["valor"])
-            data_ult = ult["data"]
-
-            if len(df_cdi) >= 2:
-                penult = df_cdi.iloc[-2]
-                cdi_variacao_dia = float(cdi_dia - penult["valor"])
+            df_cdi = _ensure_sorted(df_cdi)
+            datas_cdi = df_cdi["data"].to_numpy()
+            valores_cdi = df_cdi["valor"].to_numpy(dtype=np.float64)
+
+            cdi_dia = valores_cdi[-1]
+            data_ult = pd.Timestamp(datas_cdi[-1])
+
+            if len(valores_cdi) >= 2:
+                cdi_variacao_dia = cdi_dia - valores_cdi[-2]
             else:
                 cdi_variacao_dia = 0.0
 
             ano_ref = data_ult.year
             mes_ref = data_ult.month
 
-            # Mês atual
-            df_mes = df_cdi[
-                (df_cdi["data"].dt.year == ano_ref)
-                & (df_cdi["data"].dt.month == mes_ref)
-            ]
-            if not df_mes.empty:
-                fator_mes = (1 + df_mes["valor"] / 100.0).prod()
-                cdi_acumulado_mes = (fator_mes - 1) * 100.0
-
-            # Ano corrente
-            df_ano = df_cdi[df_cdi["data"].dt.year == ano_ref]
-            if not df_ano.empty:
-                fator_ano = (1 + df_ano["valor"] / 100.0).prod()
-                cdi_no_ano = (fator_ano - 1) * 100.0
-
-            # Últimos 12 meses
-            corte_12m_cdi = data_ult - relativedelta(years=1)
-            df_12m_cdi = df_cdi[df_cdi["data"] >= corte_12m_cdi]
-            if not df_12m_cdi.empty:
-                fator_12m = (1 + df_12m_cdi["valor"] / 100.0).prod()
-                cdi_em_12_meses = (fator_12m - 1) * 100.0
+            # Mês atual / ano corrente / últimos 12 meses: início de cada
+            # janela por busca binária, os três acumulados de uma soma de logs
+            corte_12m_cdi = _corte_anos(data_ult, 1)
+            i_mes = _indice_corte(datas_cdi, date(ano_ref, mes_ref, 1))
+            i_ano = _indice_corte(datas_cdi, date(ano_ref, 1, 1))
+            i_12m = _indice_corte(datas_cdi, corte_12m_cdi)
+
+            (
+                cdi_acumulado_mes,
+                cdi_no_ano,
+                cdi_em_12_meses,
+            ) = _cdi_acumulados(valores_cdi, i_mes, i_ano, i_12m)
     except Exception:
         pass
 
     # -------- PTAX – DÓLAR --------
     try:
-        if CAMINHO_SGS_PTAX.exists():
-            df_ptax = pd.read_csv(CAMINHO_SGS_PTAX)
-            df_ptax["data"] = pd.to_datetime(df_ptax["data"])
-        else:
-            df_ptax = buscar_ptax_venda()
+        df_ptax = _resultado(resultados, "ptax_venda")
 
         if not df_ptax.empty:
-            df_ptax = df_ptax.sort_values("data").reset_index(drop=True)
-            ult = df_ptax.iloc[-1]
-            ptax_fechamento = float(ult["valor"])
+            df_ptax = _ensure_sorted(df_ptax)
+            valores_ptax = df_ptax["valor"].to_numpy(dtype=np.float64)
+            ptax_fechamento = valores_ptax[-1]
 
-            if len(df_ptax) >= 2:
-                penult = df_ptax.iloc[-2]
+            if len(valores_ptax) >= 2:
                 ptax_variacao_dia = (
-                    (ptax_fechamento / float(penult["valor"]) - 1) * 100.0
+                    (ptax_fechamento / valores_ptax[-2] - 1) * 100.0
                 )
             else:
                 ptax_variacao_dia = 0.0
 
             resumo_fx = resumo_cambio(df_ptax)
-            ptax_nivel_12m = resumo_fx["valor_12m"]
-            ptax_nivel_24m = resumo_fx["valor_24m"]
-            ptax_var_12m = resumo_fx["var_12m"]
-            ptax_var_24m = resumo_fx["var_24m"]
+            ptax_nivel_12m = resumo_fx.valor_12m
+            ptax_nivel_24m = resumo_fx.valor_24m
+            ptax_var_12m = resumo_fx.var_12m
+            ptax_var_24m = resumo_fx.var_24m
     except Exception:
         pass
 
+    # Os valores acima são escalares numpy (float64); converte para float
+    # nativo uma única vez, aqui na montagem do dataclass.
     moeda_juros = MoedaJurosCurtoPrazo(
-        selic_meta=selic_meta,
-        cdi_acumulado_mes=cdi_acumulado_mes,
-        cdi_variacao_dia=cdi_variacao_dia,
-        ptax_fechamento=ptax_fechamento,
-        ptax_variacao_dia=ptax_variacao_dia,
+        selic_meta=_float_ou_none(selic_meta),
+        cdi_acumulado_mes=_float_ou_none(cdi_acumulado_mes),
+        cdi_variacao_dia=_float_ou_none(cdi_variacao_dia),
+        ptax_fechamento=_float_ou_none(ptax_fechamento),
+        ptax_variacao_dia=_float_ou_none(ptax_variacao_dia),
         selic_obs="",
         cdi_obs="",
         ptax_obs="",
-        cdi_dia=cdi_dia,
-        selic_12m=selic_12m,
-        selic_24m=selic_24m,
-        selic_ultima_decisao=selic_ultima_decisao,
-        cdi_no_ano=cdi_no_ano,
-        cdi_em_12_meses=cdi_em_12_meses,
+        cdi_dia=_float_ou_none(cdi_dia),
+        selic_12m=_float_ou_none(selic_12m),
+        selic_24m=_float_ou_none(selic_24m),
+        selic_ultima_decisao=_float_ou_none(selic_ultima_decisao),
+        cdi_no_ano=_float_ou_none(cdi_no_ano),
+        cdi_em_12_meses=_float_ou_none(cdi_em_12_meses),
         ptax_nivel_12m=ptax_nivel_12m,
         ptax_nivel_24m=ptax_nivel_24m,
         ptax_var_12m=ptax_var_12m,
         ptax_var_24m=ptax_var_24m,
-    )   
+    )
 
     # ---------------------
     # Ativos domésticos
     # ---------------------
-    data_curva, taxa_2a, taxa_5a = _obter_taxas_pref_2e5_anos()
+    data_curva, taxa_2a, taxa_5a = _resultado(resultados, "curva_anbima")
 
     # Ibovespa (nível + variações)
-    ibov_nivel, ibov_var_dia, ibov_var_mes, ibov_var_ano = _carregar_ibovespa_curto()
+    ibov_nivel, ibov_var_dia, ibov_var_mes, ibov_var_ano = _resultado(
+        resultados, "ibovespa"
+    )
+
+    # Histórico do DI lido uma única vez (datas já convertidas), com as
+    # taxas já agrupadas por ticker. Histórico ilegível (ou sem as colunas
+    # esperadas) vira DataFrame vazio: o DI segue só com o snapshot, sem
+    # derrubar o bloco inteiro.
+    try:
+        df_hist_di, taxas_por_ticker_di = _resultado(resultados, "di_historico")
+    except Exception:
+        df_hist_di, taxas_por_ticker_di = pd.DataFrame(), {}
+
+    # Snapshot B3: se o download falhou, segue só com o histórico
+    df_snapshot_di = resultados["di_snapshot"]
+    if isinstance(df_snapshot_di, Exception) or df_snapshot_di is None:
+        df_snapshot_di = pd.DataFrame()
 
     # DI Futuro ~2 anos e ~5 anos (B3)
     try:
@@ -1031,7 +1632,9 @@ def carregar_dados_curto_prazo_br() -> DadosCurtoPrazoBR:
             di_5_taxa,
             di_5_delta,
             fonte_di5,
-        ) = _carregar_di_futuro_2e5_anos()
+        ) = _carregar_di_futuro_2e5_anos(
+            df_hist_di, df_snapshot_di, taxas_por_ticker_di
+        )
     except Exception:
         ticker_di2 = ticker_di5 = None
         di_2_taxa = di_2_delta = di_5_taxa = di_5_delta = None
@@ -1041,7 +1644,6 @@ def carregar_dados_curto_prazo_br() -> DadosCurtoPrazoBR:
     di_2_delta_ano = None
     di_5_delta_ano = None
     try:
-        df_hist_di = carregar_historico_di_futuro()
         di_2_delta_ano = _delta_di_vs_inicio_ano(
             df_hist_di, ticker_di2, di_2_taxa
         )
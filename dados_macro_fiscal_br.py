@@ -1,23 +1,43 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 import logging
 import datetime as dt
+import time
 
 import pandas as pd
-import requests
+
+from cache_disco import DIR_CACHE_HTTP, SEM_EXPIRAR, CacheDisco
+from sessao_http import criar_sessao, ler_json
 
 
 logger = logging.getLogger(__name__)
 
+# Sessão única (keep-alive + pool) para BCB e Tesouro: as threads de
+# carregar_dados_macro_fiscal_br reaproveitam as conexões TLS abertas.
+_HTTP = criar_sessao(tentativas=3)
+
+# Cache em disco das respostas (SGS e Tesouro só atualizam 1x por dia, no
+# máximo): reruns do Streamlit / processos novos não rebaixam a série, e
+# se a API cair usamos o último arquivo salvo.
+CACHE_TTL_SEGUNDOS = 6 * 3600
+_CACHE_SGS = CacheDisco(DIR_CACHE_HTTP / "sgs")
+_CACHE_TESOURO = CacheDisco(DIR_CACHE_HTTP / "tesouro")
+
+# Memo em memória do resultado consolidado: dentro da mesma hora, reruns
+# do Streamlit no mesmo processo nem chegam a abrir o cache em disco.
+MEMO_JANELA_SEGUNDOS = 3600
+
 
 # =============================================================================
 # Dataclass principal – aqui vão morar IBC-Br, desemprego, dívida, etc.
 # Por enquanto só vamos preencher IBC-Br.
 # =============================================================================
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DadosMacroFiscalBr:
     # ----- Atividade -----
     ibcbr_nivel: Optional[float] = None           # nível atual (série SA)
@@ -61,7 +81,66 @@ class DadosMacroFiscalBr:
 # =============================================================================
 # Helpers para BCB / SGS
 # =============================================================================
-def _baixar_serie_sgs_json(codigo: int, n_ultimos: int = 24) -> pd.DataFrame:
+def _datas_por_valores_unicos(textos: pd.Series, **kwargs) -> pd.Series:
+    """
+    pd.to_datetime só sobre os textos distintos, mapeando de volta para as
+    linhas: o strptime roda O(únicos) em vez de O(linhas). `kwargs` vão
+    direto para o pd.to_datetime (format, dayfirst, errors...).
+    """
+    unicos = textos.unique()
+    convertidos = pd.to_datetime(unicos, **kwargs)
+    return textos.map(dict(zip(unicos, convertidos))).astype("datetime64[ns]")
+
+
+def _baixar_serie_sgs_json(
+    codigo: int,
+    n_ultimos: int = 24,
+    values_only: bool = False,
+) -> pd.DataFrame | list[tuple[int, float]]:
+    """
+    Série SGS (N últimos registros), passando pelo cache em disco:
+    arquivo com menos de CACHE_TTL_SEGUNDOS é devolvido sem ir à API;
+    se a API falhar, cai no último arquivo salvo (se houver).
+
+    values_only=True devolve só [(chave_mes, valor), ...] em ordem
+    cronológica (ver _pontos_mensais), para quem só consulta meia dúzia
+    de meses e não precisa do DataFrame.
+    """
+    chave = f"{codigo}_ultimos{n_ultimos}"
+    df = _CACHE_SGS.ler(chave, CACHE_TTL_SEGUNDOS)
+
+    if df is None:
+        try:
+            df = _baixar_serie_sgs_json_api(codigo, n_ultimos)
+        except Exception:
+            df = _CACHE_SGS.ler(chave, SEM_EXPIRAR)
+            if df is None:
+                raise
+            logger.warning("SGS %s indisponível; usando cache em disco.", codigo)
+        else:
+            _CACHE_SGS.salvar(chave, df)
+
+    return _pontos_mensais(df) if values_only else df
+
+
+def _pontos_mensais(df: pd.DataFrame) -> list[tuple[int, float]]:
+    """
+    (chave_mes, valor) para cada linha, com chave_mes = ano*12 + mes - 1:
+    "n meses atrás" vira `chave - n` e a consulta é um dict.get. As chaves
+    saem do datetime64[M] direto no numpy, sem .dt.year/.dt.month.
+    """
+    meses = df["data"].to_numpy(dtype="datetime64[M]").astype("int64") + 1970 * 12
+    valores = df["valor"].to_numpy(dtype="float64")
+    return list(zip(meses.tolist(), valores.tolist()))
+
+
+def _mes_ref_str(chave_mes: int) -> str:
+    """chave_mes (ano*12 + mes - 1) -> 'mm/aaaa'"""
+    ano, mes0 = divmod(chave_mes, 12)
+    return f"{mes0 + 1:02d}/{ano}"
+
+
+def _baixar_serie_sgs_json_api(codigo: int, n_ultimos: int = 24) -> pd.DataFrame:
     """
     Baixa a série SGS em JSON e devolve apenas os N últimos registros.
 
@@ -71,20 +150,25 @@ def _baixar_serie_sgs_json(codigo: int, n_ultimos: int = 24) -> pd.DataFrame:
     """
     url = f"https://api.bcb.gov.br/dados/serie/bcdata.sgs.{codigo}/dados?formato=json"
 
-    resp = requests.get(url, timeout=10)
+    resp = _HTTP.get(url, timeout=10)
     resp.raise_for_status()
-    data = resp.json()
+    data = ler_json(resp)
 
     df = pd.DataFrame(data)
     if df.empty:
         raise ValueError(f"Série SGS {codigo} retornou vazio.")
 
-    # data vem em dd/mm/aaaa, valor vem como string com vírgula
-    df["data"] = pd.to_datetime(df["data"], format="%d/%m/%Y")
+    # data vem em dd/mm/aaaa, valor vem como string com vírgula.
+    # Remonta a data em ISO (aaaa-mm-dd) por fatiamento: esse formato cai
+    # no parser em C do pandas; cache=True converte cada texto uma vez só.
+    txt = df["data"].str
+    iso = txt.slice(6, 10) + "-" + txt.slice(3, 5) + "-" + txt.slice(0, 2)
+    df["data"] = pd.to_datetime(iso, format="%Y-%m-%d", cache=True)
     df["valor"] = df["valor"].str.replace(",", ".", regex=False).astype(float)
 
-    # ordena cronologicamente e pega só os N últimos
-    df = df.sort_values("data").tail(n_ultimos).reset_index(drop=True)
+    # pega só os N mais recentes (seleção parcial, sem ordenar a série
+    # inteira) e ordena cronologicamente só esse pedaço
+    df = df.nlargest(n_ultimos, "data").sort_values("data").reset_index(drop=True)
     return df
 
 
@@ -105,65 +189,54 @@ def _carregar_ibcbr() -> tuple[
     codigo_sa = 24364   # IBC-Br dessazonalizado
     codigo_nsa = 24363  # IBC-Br sem ajuste sazonal
 
+    # As duas séries são independentes: dispara os dois downloads juntos
+    # (o GIL é liberado no I/O do requests) e só então trata cada uma.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        fut_sa = pool.submit(_baixar_serie_sgs_json, codigo_sa, 36, True)
+        fut_nsa = pool.submit(_baixar_serie_sgs_json, codigo_nsa, 120, True)
+
     # --- Série dessazonalizada: nível + m/m + 3m ---
     try:
-        df_sa = _baixar_serie_sgs_json(codigo_sa, n_ultimos=36)
+        pontos_sa = fut_sa.result()
     except Exception as exc:  # noqa: BLE001
         logger.error("Erro ao baixar IBC-Br SA (24364): %s", exc)
         return None, None, None, None, None
 
-    if len(df_sa) < 2:
+    if len(pontos_sa) < 2:
         return None, None, None, None, None
 
-    df_sa = df_sa.sort_values("data").reset_index(drop=True)
-    ultimo_sa = df_sa.iloc[-1]
-    penultimo_sa = df_sa.iloc[-2]
-
-    nivel_sa = float(ultimo_sa["valor"])
-    var_mom = (nivel_sa / float(penultimo_sa["valor"]) - 1.0) * 100.0
-    data_ref = ultimo_sa["data"]
-    ref_str = data_ref.strftime("%m/%Y")
+    mes_ref, nivel_sa = pontos_sa[-1]
+    var_mom = (nivel_sa / pontos_sa[-2][1] - 1.0) * 100.0
+    ref_str = _mes_ref_str(mes_ref)
 
     # variação 3m dessaz. (acumulada nos últimos 3 dados mensais)
     var_3m: Optional[float]
     # tentamos achar o valor da série SA de 3 meses atrás (mesmo mês/ano)
-    data_3m = data_ref - pd.DateOffset(months=3)
-    mask_3m = (df_sa["data"].dt.year == data_3m.year) & (
-        df_sa["data"].dt.month == data_3m.month
-    )
-    df_3m = df_sa.loc[mask_3m]
-    if df_3m.empty:
+    valor_3m = dict(pontos_sa).get(mes_ref - 3)
+    if valor_3m is None:
         var_3m = None
     else:
-        valor_3m = float(df_3m.iloc[-1]["valor"])
         var_3m = (nivel_sa / valor_3m - 1.0) * 100.0
 
     # --- Série sem ajuste: variação a/a ---
     try:
-        df_nsa = _baixar_serie_sgs_json(codigo_nsa, n_ultimos=120)
+        pontos_nsa = fut_nsa.result()
     except Exception as exc:  # noqa: BLE001
         logger.error("Erro ao baixar IBC-Br sem ajuste (24363): %s", exc)
         return nivel_sa, var_mom, ref_str, None, var_3m
 
-    df_nsa = df_nsa.sort_values("data").reset_index(drop=True)
+    # se um mês aparecer repetido, o dict fica com o último
+    nsa_por_mes = dict(pontos_nsa)
 
     # valor atual na série sem ajuste (mesmo mês/ano da ref)
-    mask_atual = (df_nsa["data"].dt.year == data_ref.year) & (
-        df_nsa["data"].dt.month == data_ref.month
-    )
-    df_atual = df_nsa.loc[mask_atual]
+    valor_atual = nsa_por_mes.get(mes_ref)
 
     # valor do mesmo mês do ano anterior
-    mask_aa = (df_nsa["data"].dt.year == data_ref.year - 1) & (
-        df_nsa["data"].dt.month == data_ref.month
-    )
-    df_aa = df_nsa.loc[mask_aa]
+    valor_aa = nsa_por_mes.get(mes_ref - 12)
 
-    if df_atual.empty or df_aa.empty:
+    if valor_atual is None or valor_aa is None:
         var_aa = None
     else:
-        valor_atual = float(df_atual.iloc[-1]["valor"])
-        valor_aa = float(df_aa.iloc[-1]["valor"])
         var_aa = (valor_atual / valor_aa - 1.0) * 100.0
 
     return nivel_sa, var_mom, ref_str, var_aa, var_3m
@@ -184,39 +257,26 @@ def _carregar_divida_bruta() -> tuple[
     codigo_divida = 13762  # DBGG (% PIB)
 
     try:
-        df = _baixar_serie_sgs_json(codigo_divida, n_ultimos=240)
+        pontos = _baixar_serie_sgs_json(
+            codigo_divida, n_ultimos=240, values_only=True
+        )
     except Exception as exc:  # noqa: BLE001
         logger.error("Erro ao baixar Dívida Bruta GG (SGS %s): %s", codigo_divida, exc)
         return None, None, None, None, None
 
-    if len(df) < 2:
+    if len(pontos) < 2:
         return None, None, None, None, None
 
-    df = df.sort_values("data").reset_index(drop=True)
-
-    ultimo = df.iloc[-1]
-    penultimo = df.iloc[-2]
-
-    data_ult = ultimo["data"]
-    nivel = float(ultimo["valor"])
-    ref_str = data_ult.strftime("%m/%Y")
+    mes_ref, nivel = pontos[-1]
+    ref_str = _mes_ref_str(mes_ref)
 
     # variação m/m em p.p. (mês contra mês anterior)
-    delta_mom = nivel - float(penultimo["valor"])
-
-    ano_ref = data_ult.year
-    mes_ref = data_ult.month
+    delta_mom = nivel - pontos[-2][1]
 
-    # mesmo mês de 12 meses atrás
-    mask_12m = (df["data"].dt.year == ano_ref - 1) & (df["data"].dt.month == mes_ref)
-    df_12m = df.loc[mask_12m]
-
-    # mesmo mês de 24 meses atrás
-    mask_24m = (df["data"].dt.year == ano_ref - 2) & (df["data"].dt.month == mes_ref)
-    df_24m = df.loc[mask_24m]
-
-    nivel_12m = float(df_12m.iloc[-1]["valor"]) if not df_12m.empty else None
-    nivel_24m = float(df_24m.iloc[-1]["valor"]) if not df_24m.empty else None
+    # mesmo mês de 12 e de 24 meses atrás
+    por_mes = dict(pontos)
+    nivel_12m = por_mes.get(mes_ref - 12)
+    nivel_24m = por_mes.get(mes_ref - 24)
 
     return nivel, delta_mom, nivel_12m, nivel_24m, ref_str
 
@@ -224,7 +284,6 @@ from io import BytesIO
 from typing import Optional, Tuple
 
 import pandas as pd
-import requests
 import logging
 
 logger = logging.getLogger(__name__)
@@ -235,37 +294,41 @@ URL_TESOURO_RESULTADO_PRIMARIO = (
 )
 
 
-def _carregar_resultado_primario_real_ipea_style() -> Tuple[
-    Optional[float],
-    Optional[float],
-    Optional[float],
-    Optional[float],
-    Optional[float],
-    Optional[float],
-]:
+def _baixar_resultado_primario() -> Optional[pd.DataFrame]:
     """
-    Versão simplificada: Resultado Primário do Governo Central em
-    valores NOMINAIS (R$ bi), usando a série 10.04.1 do Tesouro.
+    Série 10.04.1 do Tesouro (colunas data, valor_milhoes), passando pelo
+    cache em disco (CACHE_TTL_SEGUNDOS); se o download falhar, usa o
+    último arquivo salvo. None se não houver nem download nem cache.
+    """
+    chave = "resultado_primario_8055"
+    df = _CACHE_TESOURO.ler(chave, CACHE_TTL_SEGUNDOS)
+    if df is not None:
+        return df
 
-    Retorna:
-      0) primário do mês em R$ bi (corrente)
-      1) delta em R$ bi vs mesmo mês do ano anterior
-      2) variação nominal a/a (%) do primário do mês
-      3) (reservado para futuro) -> None
-      4) saldo 12m (R$ bi, nominal)
-      5) saldo 12m 12m atrás (R$ bi, nominal)
+    df = _baixar_resultado_primario_api()
+    if df is None:
+        return _CACHE_TESOURO.ler(chave, SEM_EXPIRAR)
+
+    _CACHE_TESOURO.salvar(chave, df)
+    return df
+
+
+def _baixar_resultado_primario_api() -> Optional[pd.DataFrame]:
+    """
+    Baixa e limpa o CSV do Tesouro: data (datetime) + valor_milhoes,
+    ordenado por data. None em qualquer erro (já logado).
     """
     # ---------------------------
     # 1) Baixa a série do Tesouro (CSV ; em latin-1)
     # ---------------------------
     try:
-        resp = requests.get(URL_TESOURO_RESULTADO_PRIMARIO, timeout=30)
+        resp = _HTTP.get(URL_TESOURO_RESULTADO_PRIMARIO, timeout=30)
         resp.raise_for_status()
     except Exception:
         logger.exception(
             "Erro ao baixar série de resultado primário do Tesouro."
         )
-        return (None, None, None, None, None, None)
+        return None
 
     try:
         df_prim = pd.read_csv(
@@ -273,16 +336,17 @@ def _carregar_resultado_primario_real_ipea_style() -> Tuple[
             sep=";",
             decimal=",",
             encoding="latin-1",
-            engine="python",
+            engine="c",
+            low_memory=False,
         )
     except Exception:
         logger.exception(
             "Erro ao ler arquivo de resultado primário (CSV Tesouro)."
         )
-        return (None, None, None, None, None, None)
+        return None
 
     if df_prim.empty or df_prim.shape[1] < 2:
-        return (None, None, None, None, None, None)
+        return None
 
     # normalmente 1ª coluna = data, 2ª = valor
     col_data = df_prim.columns[0]
@@ -296,10 +360,12 @@ def _carregar_resultado_primario_real_ipea_style() -> Tuple[
     # tenta data com dia primeiro; se der tudo NaT, tenta outros formatos simples
     raw_data = df_prim["data"].astype(str).str.strip()
 
-    data_parsed = pd.to_datetime(raw_data, dayfirst=True, errors="coerce")
+    data_parsed = _datas_por_valores_unicos(
+        raw_data, dayfirst=True, errors="coerce"
+    )
     if data_parsed.isna().all():
         # tenta formato ISO (yyyy-mm-dd)
-        data_parsed = pd.to_datetime(raw_data, errors="coerce")
+        data_parsed = _datas_por_valores_unicos(raw_data, errors="coerce")
 
     df_prim["data"] = data_parsed
     df_prim["valor_milhoes"] = pd.to_numeric(
@@ -309,7 +375,34 @@ def _carregar_resultado_primario_real_ipea_style() -> Tuple[
     df_prim = df_prim.dropna(subset=["data", "valor_milhoes"]).sort_values(
         "data"
     )
-    if df_prim.empty:
+    return df_prim
+
+
+def _carregar_resultado_primario_real_ipea_style() -> Tuple[
+    Optional[float],
+    Optional[float],
+    Optional[float],
+    Optional[float],
+    Optional[float],
+    Optional[float],
+]:
+    """
+    Versão simplificada: Resultado Primário do Governo Central em
+    valores NOMINAIS (R$ bi), usando a série 10.04.1 do Tesouro.
+
+    Retorna:
+      0) primário do mês em R$ bi (corrente)
+      1) delta em R$ bi vs mesmo mês do ano anterior
+      2) variação nominal a/a (%) do primário do mês
+      3) (reservado para futuro) -> None
+      4) saldo 12m (R$ bi, nominal)
+      5) saldo 12m 12m atrás (R$ bi, nominal)
+    """
+    # ---------------------------
+    # 1) Série do Tesouro (cache em disco ou download)
+    # ---------------------------
+    df_prim = _baixar_resultado_primario()
+    if df_prim is None or df_prim.empty:
         return (None, None, None, None, None, None)
 
     # converte para R$ bi NOMINAIS
@@ -341,18 +434,13 @@ def _carregar_resultado_primario_real_ipea_style() -> Tuple[
         delta_bi_aa = None
         var_aa_pct = None
 
-    # saldo 12m (rolling de 12 meses)
-    df_prim["valor_bi_12m"] = df_prim["valor_bi"].rolling(window=12).sum()
-    serie_12m = df_prim["valor_bi_12m"].dropna()
+    # saldo 12m: só as duas janelas usadas (últimos 12 meses e os 12
+    # anteriores), somadas direto no array, sem rolling na série toda
+    valores_bi = df_prim["valor_bi"].to_numpy()
+    n = len(valores_bi)
 
-    if serie_12m.empty:
-        prim_12m_bi = None
-        prim_12m_bi_prev = None
-    else:
-        prim_12m_bi = float(serie_12m.iloc[-1])
-        prim_12m_bi_prev = (
-            float(serie_12m.iloc[-13]) if len(serie_12m) > 12 else None
-        )
+    prim_12m_bi = float(valores_bi[-12:].sum()) if n >= 12 else None
+    prim_12m_bi_prev = float(valores_bi[-24:-12].sum()) if n >= 24 else None
 
     # mapeia para os 6 campos do dataclass
     return (
@@ -372,8 +460,33 @@ def carregar_dados_macro_fiscal_br() -> DadosMacroFiscalBr:
     """
     Ponto único de acesso aos dados macro/fiscais.
     IBC-Br + Dívida Bruta GG + (futuro) Primário, CDS, etc.
+
+    O resultado fica memoizado no processo por janela de
+    MEMO_JANELA_SEGUNDOS (o dataclass é congelado, então pode ser
+    compartilhado entre chamadas sem cópia). Para forçar recarga:
+    carregar_dados_macro_fiscal_br.cache_clear().
+    """
+    janela = int(time.time() // MEMO_JANELA_SEGUNDOS)
+    return _carregar_dados_macro_fiscal_br_cached(janela)
+
+
+@lru_cache(maxsize=1)
+def _carregar_dados_macro_fiscal_br_cached(janela: int) -> DadosMacroFiscalBr:
     """
-    ibc_nivel, ibc_var_mom, ibc_ref, ibc_var_aa, ibc_var_3m = _carregar_ibcbr()
+    `janela` só entra como chave do lru_cache: muda a cada hora e força
+    uma nova carga.
+
+    Os três blocos só fazem I/O (BCB e Tesouro) e não dependem um do
+    outro, então rodam em paralelo: o tempo total vira o do download
+    mais lento, e não a soma deles. Cada bloco já trata os próprios
+    erros devolvendo Nones.
+    """
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        fut_ibc = pool.submit(_carregar_ibcbr)
+        fut_div = pool.submit(_carregar_divida_bruta)
+        fut_prim = pool.submit(_carregar_resultado_primario_real_ipea_style)
+
+    ibc_nivel, ibc_var_mom, ibc_ref, ibc_var_aa, ibc_var_3m = fut_ibc.result()
 
     (
         div_nivel,
@@ -381,7 +494,7 @@ def carregar_dados_macro_fiscal_br() -> DadosMacroFiscalBr:
         div_12m,
         div_24m,
         div_ref,
-    ) = _carregar_divida_bruta()
+    ) = fut_div.result()
 
     # resultado primário
     (
@@ -391,7 +504,7 @@ def carregar_dados_macro_fiscal_br() -> DadosMacroFiscalBr:
         despesa_real_var_aa_pct,
         primario_ano_real_bi,
         primario_ano_real_bi_prev,
-    ) = _carregar_resultado_primario_real_ipea_style()
+    ) = fut_prim.result()
 
     return DadosMacroFiscalBr(
         # IBC-Br
@@ -420,3 +533,8 @@ def carregar_dados_macro_fiscal_br() -> DadosMacroFiscalBr:
     )
 
 
+carregar_dados_macro_fiscal_br.cache_clear = (
+    _carregar_dados_macro_fiscal_br_cached.cache_clear
+)
+
+
@@ -2,9 +2,19 @@
 # -*- coding: utf-8 -*-
 
 import os
-import requests
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from datetime import date, datetime, time
+from operator import itemgetter
+from typing import Optional
+
+from cache_disco import ler_parquet_irmao, salvar_parquet_irmao
+from sessao_http import criar_sessao, ler_json
+
+try:
+    import pyarrow as pa  # schema fixo do .parquet do histórico
+except ImportError:
+    pa = None
 
 # ============================================================
 # CONFIG BÁSICA
@@ -16,6 +26,38 @@ API_B3_DI1 = "https://cotacao.b3.com.br/mds/api/v1/DerivativeQuotation/DI1"
 HIST_DIR = "data/curvas_tesouro/di_futuro"
 HIST_PATH = os.path.join(HIST_DIR, "di1_historico.csv")
 
+# Dia da semana (0 = segunda) em que o histórico é reescrito por inteiro
+# (dedup + limpeza); nos outros dias o snapshot novo só é anexado ao CSV.
+DIA_COMPACTACAO = 0
+
+# A partir desta hora o pregão do DI já fechou: se o histórico foi gravado
+# depois dela e já tem o snapshot de hoje, não há o que baixar de novo até
+# o dia seguinte. Gravado antes (snapshot intradiário), baixa de novo e
+# substitui as linhas de hoje pelas do fechamento.
+HORA_FECHAMENTO = 18
+
+# Schema do di1_historico.parquet (gravado junto com o CSV). O arquivo
+# usa só as colunas presentes no CSV (colunas 100% vazias ficam de fora);
+# vencimento fica como texto, igual ao que o read_csv devolve.
+SCHEMA_HIST = (
+    pa.schema(
+        [
+            ("ajuste", pa.float64()),
+            ("data", pa.date32()),
+            ("open_interest", pa.float64()),
+            ("pu", pa.float64()),
+            ("taxa", pa.float64()),
+            ("ticker", pa.string()),
+            ("ultimo_preco", pa.float64()),
+            ("variacao_bps", pa.float64()),
+            ("vencimento", pa.string()),
+            ("volume", pa.float64()),
+        ]
+    )
+    if pa is not None
+    else None
+)
+
 # cabeçalhos para imitar um navegador
 HEADERS = {
     "User-Agent": (
@@ -29,6 +71,9 @@ HEADERS = {
     "Referer": "https://www.b3.com.br/",
 }
 
+# sessão única (keep-alive + pool) para todas as chamadas à API da B3
+_SESSION = criar_sessao(headers=HEADERS)
+
 
 # ============================================================
 # HELPER PARA BUSCAR JSON
@@ -41,15 +86,15 @@ def _get_json(url: str, timeout: int = 30) -> dict:
     """
     Faz GET na API da B3 e devolve o JSON já convertido.
 
-    Se der erro de rede/HTTP (521, 5xx, timeout etc.), devolve
-    um dict vazio e deixa o chamador seguir a vida usando
-    histórico antigo em vez de quebrar o app.
+    Se der erro de rede/HTTP (521, 5xx, timeout etc.) ou o corpo não for
+    JSON válido, devolve um dict vazio e deixa o chamador seguir a vida
+    usando histórico antigo em vez de quebrar o app.
     """
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=timeout)
+        resp = _SESSION.get(url, timeout=timeout)
         resp.raise_for_status()
-        return resp.json()
-    except RequestException:
+        return ler_json(resp)
+    except (RequestException, ValueError):  # ValueError = JSON inválido
         return {}
 
 
@@ -57,6 +102,13 @@ def _get_json(url: str, timeout: int = 30) -> dict:
 # BAIXAR SNAPSHOT DO DI FUTURO (TODOS OS CONTRATOS)
 # ============================================================
 
+# Campos lidos de cada contrato: SctyQtn (cotação) e AsstSummry (resumo)
+_CAMPOS_COTACAO = ("curPrc", "prvsDayAdjstmntPric", "prcFlcn")
+_CAMPOS_RESUMO = ("mtrtyCode", "traddCtrctsQty", "opnCtrcts")
+_pegar_cotacao = itemgetter(*_CAMPOS_COTACAO)
+_pegar_resumo = itemgetter(*_CAMPOS_RESUMO)
+
+
 def baixar_snapshot_di_futuro() -> pd.DataFrame:
     """
     Baixa TODOS os contratos DI1 da B3 no momento da chamada.
@@ -94,62 +146,88 @@ def baixar_snapshot_di_futuro() -> pd.DataFrame:
         # DataFrame vazio, para o chamador decidir o que fazer
         return pd.DataFrame()
 
-    linhas = []
-    data_hoje = datetime.now().date()
+    # Colunas montadas em listas paralelas (uma por campo) e o DataFrame
+    # sai de um dict de colunas, sem inferir schema linha a linha.
+    tickers, vencs_raw = [], []
+    taxas, variacoes, ajustes, pus = [], [], [], []
+    volumes, open_interests, ultimos = [], [], []
 
     for item in contratos_raw:
+        ticker = item.get("symb")                       # ex.: DI1J30
+        if not ticker:
+            continue
+
         scty_qtn = item.get("SctyQtn", {})              # cotação
         asset = item.get("asset", {})
         asst_summary = asset.get("AsstSummry", {})      # resumo do ativo
 
-        ticker = item.get("symb")                       # ex.: DI1J30
-
-        venc_raw = asst_summary.get("mtrtyCode")
+        # Caso comum: todas as chaves presentes -> um itemgetter por dict.
+        # Faltando alguma, cai no .get chave a chave (None no que faltar).
         try:
-            vencimento = (
-                datetime.strptime(venc_raw, "%Y-%m-%d").date()
-                if venc_raw else None
-            )
-        except Exception:
-            vencimento = None
+            cur_prc, ajuste, variacao_bps = _pegar_cotacao(scty_qtn)
+        except KeyError:
+            cur_prc, ajuste, variacao_bps = map(scty_qtn.get, _CAMPOS_COTACAO)
+        try:
+            venc_raw, volume, open_interest = _pegar_resumo(asst_summary)
+        except KeyError:
+            venc_raw, volume, open_interest = map(asst_summary.get, _CAMPOS_RESUMO)
 
+        tickers.append(ticker)
+        vencs_raw.append(venc_raw)
         # Pode não haver último negócio (curPrc) em alguns dias.
         # Nesse caso, usamos o ajuste do dia anterior como proxy da taxa.
-        cur_prc = scty_qtn.get("curPrc")
-        ajuste = scty_qtn.get("prvsDayAdjstmntPric")
-
-        if cur_prc is not None:
-            taxa = cur_prc
-        else:
-            taxa = ajuste  # fallback seguro para dias sem ULT
-
-        variacao_bps = scty_qtn.get("prcFlcn")
-        pu = cur_prc  # se quiser, pode manter o PU só com o último preço
-
-        volume = asst_summary.get("traddCtrctsQty")
-        open_interest = asst_summary.get("opnCtrcts")
-        ultimo_preco = scty_qtn.get("curPrc")
+        taxas.append(cur_prc if cur_prc is not None else ajuste)
+        variacoes.append(variacao_bps)
+        ajustes.append(ajuste)
+        pus.append(cur_prc)  # se quiser, pode manter o PU só com o último preço
+        volumes.append(volume)
+        open_interests.append(open_interest)
+        ultimos.append(cur_prc)
+
+    df = pd.DataFrame(
+        {
+            "data": datetime.now().date(),
+            "ticker": tickers,
+            "vencimento": converter_vencimentos(vencs_raw),
+            "taxa": taxas,
+            "variacao_bps": variacoes,
+            "ajuste": ajustes,
+            "pu": pus,
+            "volume": volumes,
+            "open_interest": open_interests,
+            "ultimo_preco": ultimos,
+        }
+    )
+    return df
 
-        if not ticker:
-            continue
 
-        linhas.append(
-            {
-                "data": data_hoje,
-                "ticker": ticker,
-                "vencimento": vencimento,
-                "taxa": taxa,
-                "variacao_bps": variacao_bps,
-                "ajuste": ajuste,
-                "pu": pu,
-                "volume": volume,
-                "open_interest": open_interest,
-                "ultimo_preco": ultimo_preco,
-            }
+def converter_vencimentos(vencs_raw: list) -> np.ndarray:
+    """
+    'YYYY-MM-DD' -> date, de uma vez via datetime64[D] (aceita o
+    9999-12-31 do DI1D, que estoura o datetime64[ns] do pandas).
+    Vazio/None vira None. Se algum texto não for data válida, cai no
+    strptime item a item, com None para o que falhar.
+    """
+    try:
+        return (
+            np.array([v or "" for v in vencs_raw], dtype="U10")
+            .astype("datetime64[D]")
+            .astype(object)
         )
+    except (TypeError, ValueError):
+        pass
 
-    df = pd.DataFrame(linhas)
-    return df
+    vencimentos = []
+    for venc_raw in vencs_raw:
+        try:
+            vencimento = (
+                datetime.strptime(venc_raw, "%Y-%m-%d").date()
+                if venc_raw else None
+            )
+        except Exception:
+            vencimento = None
+        vencimentos.append(vencimento)
+    return np.array(vencimentos, dtype=object)
 
 
 # ============================================================
@@ -161,10 +239,19 @@ def atualizar_historico_di_futuro(caminho: str = HIST_PATH) -> pd.DataFrame:
     Atualiza o arquivo di1_historico.csv com o snapshot diário da B3.
 
     - Se o arquivo não existir, cria.
-    - Se existir e tiver dados, concatena apenas datas novas.
+    - Caso comum (data nova, mesmas colunas): só anexa as linhas do dia
+      no fim do CSV, sem reescrever o histórico.
+    - Se a data de hoje já estiver no arquivo, se o snapshot trouxer
+      coluna nova ou no DIA_COMPACTACAO: reescreve tudo (dedup por
+      data + ticker).
+    - Em todos os casos devolve o histórico completo.
     - Remove colunas completamente vazias (evita FutureWarning).
-    - Retorna o DataFrame final.
+    - Se o arquivo foi gravado hoje depois de HORA_FECHAMENTO e já tem a
+      data de hoje, nem chama a B3: devolve o histórico salvo.
     """
+    if _gravado_apos_fechamento(caminho):
+        return carregar_historico_di_futuro(caminho)
+
     df_novo = baixar_snapshot_di_futuro()
 
     # Garante que a pasta existe
@@ -173,9 +260,7 @@ def atualizar_historico_di_futuro(caminho: str = HIST_PATH) -> pd.DataFrame:
     # Se não veio nada da B3 -> devolve histórico antigo ou DF vazio
     if df_novo is None or df_novo.empty:
         if os.path.exists(caminho) and os.path.getsize(caminho) > 0:
-            df_old = pd.read_csv(caminho, parse_dates=["data"])
-            df_old["data"] = df_old["data"].dt.date
-            return df_old
+            return carregar_historico_di_futuro(caminho)
 
         # Se não existe histórico, cria DF vazio completo
         colunas = [
@@ -184,6 +269,94 @@ def atualizar_historico_di_futuro(caminho: str = HIST_PATH) -> pd.DataFrame:
         ]
         return pd.DataFrame(columns=colunas)
 
+    # Converte a data do novo snapshot
+    df_novo["data"] = pd.to_datetime(df_novo["data"]).dt.date
+
+    if datetime.now().weekday() != DIA_COMPACTACAO:
+        df_hist = _anexar_ao_historico(df_novo, caminho)
+        if df_hist is not None:
+            return df_hist
+
+    return _reescrever_historico(df_novo, caminho)
+
+
+def _gravado_apos_fechamento(caminho: str) -> bool:
+    """
+    True se o CSV foi gravado hoje a partir de HORA_FECHAMENTO e termina
+    na data de hoje, ou seja, já guarda o ajuste de fechamento do dia.
+    """
+    hoje = date.today()
+    fechamento = datetime.combine(hoje, time(HORA_FECHAMENTO))
+    try:
+        gravado_em = datetime.fromtimestamp(os.path.getmtime(caminho))
+    except OSError:
+        return False
+
+    return gravado_em >= fechamento and _ultima_data_historico(caminho) == hoje
+
+
+def _ultima_data_historico(caminho: str) -> Optional[date]:
+    """
+    Última `data` gravada no CSV do histórico, lendo só essa coluna.
+    None se o arquivo não existir, estiver vazio ou ilegível.
+    """
+    if not os.path.exists(caminho) or os.path.getsize(caminho) == 0:
+        return None
+
+    try:
+        datas = pd.read_csv(caminho, usecols=["data"], parse_dates=["data"])
+    except Exception:
+        return None
+
+    if datas.empty:
+        return None
+    return datas["data"].max().date()
+
+
+def _anexar_ao_historico(
+    df_novo: pd.DataFrame, caminho: str
+) -> Optional[pd.DataFrame]:
+    """
+    Anexa `df_novo` no fim do CSV (modo "a", sem cabeçalho), na ordem de
+    colunas do arquivo, e devolve o histórico completo (mesmo retorno de
+    _reescrever_historico). Devolve None, sem mexer no arquivo, quando o
+    append não é seguro e é preciso reescrever tudo:
+    - histórico inexistente/vazio;
+    - alguma data do snapshot não é posterior à última data do arquivo;
+    - o snapshot tem coluna preenchida que o cabeçalho não tem.
+    """
+    ultima_data = _ultima_data_historico(caminho)
+    if ultima_data is None or min(df_novo["data"]) <= ultima_data:
+        return None
+
+    try:
+        colunas_arquivo = list(pd.read_csv(caminho, nrows=0).columns)
+    except Exception:
+        return None
+
+    colunas_novas = df_novo.dropna(axis=1, how="all").columns
+    if not set(colunas_novas).issubset(colunas_arquivo):
+        return None
+
+    # parquet lido ANTES do append (depois dele o CSV fica mais novo)
+    df_parquet = ler_parquet_irmao(caminho)
+
+    df_anexar = df_novo.reindex(columns=colunas_arquivo)
+    with open(caminho, "a", newline="", encoding="utf-8") as f:
+        df_anexar.to_csv(f, header=False, index=False)
+
+    if df_parquet is not None:
+        _salvar_parquet_historico(
+            pd.concat([df_parquet, df_anexar], ignore_index=True), caminho
+        )
+
+    # histórico inteiro já tipado: do parquet recém-gravado ou, se ele não
+    # existir / não tiver sido gravado, do CSV
+    return carregar_historico_di_futuro(caminho)
+
+
+def _reescrever_historico(df_novo: pd.DataFrame, caminho: str) -> pd.DataFrame:
+    """Junta histórico antigo + snapshot, deduplica e regrava o CSV inteiro."""
     # Carrega histórico antigo (se existir)
     if os.path.exists(caminho) and os.path.getsize(caminho) > 0:
         df_old = pd.read_csv(caminho, parse_dates=["data"])
@@ -192,9 +365,6 @@ def atualizar_historico_di_futuro(caminho: str = HIST_PATH) -> pd.DataFrame:
         # histórico inexistente ou vazio → cria vazio com as mesmas colunas
         df_old = pd.DataFrame(columns=df_novo.columns)
 
-    # Converte a data do novo snapshot
-    df_novo["data"] = pd.to_datetime(df_novo["data"]).dt.date
-    
     # Agora garantimos que AMBOS têm as mesmas colunas
     colunas_final = sorted(set(df_old.columns).union(set(df_novo.columns)))
     df_old = df_old.reindex(columns=colunas_final)
@@ -222,17 +392,48 @@ def atualizar_historico_di_futuro(caminho: str = HIST_PATH) -> pd.DataFrame:
 
     # Salva
     df.to_csv(caminho, index=False)
+    _salvar_parquet_historico(df, caminho)
 
     return df
 
 
+def _salvar_parquet_historico(df: pd.DataFrame, caminho: str) -> None:
+    """
+    Grava o .parquet ao lado do CSV do histórico (schema SCHEMA_HIST,
+    restrito às colunas do DataFrame). Sem pyarrow ou com coluna fora do
+    schema, não grava nada: os leitores continuam no CSV.
+    """
+    if SCHEMA_HIST is None or not set(df.columns).issubset(SCHEMA_HIST.names):
+        return
+
+    df = df.copy()
+    # vencimento chega como date (snapshot) ou texto (CSV): tudo vira texto
+    df["vencimento"] = df["vencimento"].map(
+        lambda v: None if pd.isna(v) else (
+            v.isoformat() if hasattr(v, "isoformat") else str(v)
+        )
+    )
+    schema = pa.schema([SCHEMA_HIST.field(c) for c in df.columns])
+    salvar_parquet_irmao(df, caminho, schema=schema)
+
+
 # ============================================================
 # CARREGAR HISTÓRICO
 # ============================================================
 
 def carregar_historico_di_futuro(caminho: str = HIST_PATH) -> pd.DataFrame:
+    """
+    Carrega o histórico de DI Futuro. Prefere o .parquet gravado junto
+    com o CSV (já tipado, `data` volta como date); cai no CSV se o
+    parquet não existir ou estiver desatualizado.
+    """
     if not os.path.exists(caminho):
         raise FileNotFoundError(f"Arquivo histórico não encontrado: {caminho}")
+
+    df = ler_parquet_irmao(caminho)
+    if df is not None:
+        return df
+
     df = pd.read_csv(caminho, parse_dates=["data"])
     df["data"] = df["data"].dt.date
     return df
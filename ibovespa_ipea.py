@@ -6,12 +6,27 @@ from __future__ import annotations
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Tuple
 
+import numpy as np
 import pandas as pd
 import requests
 import urllib3
 
+try:
+    import pyarrow as pa  # schema fixo do .parquet do histórico
+except ImportError:
+    pa = None
+
+from cache_disco import (
+    DIR_CACHE_HTTP,
+    SEM_EXPIRAR,
+    CacheDisco,
+    ler_parquet_irmao,
+    salvar_parquet_irmao,
+)
+from sessao_http import criar_sessao, ler_json
+
 # O IPEA está com problema de certificado SSL.
 # Esta linha desativa o aviso de "InsecureRequestWarning"
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -28,16 +43,62 @@ IBOV_SERCODIGO = "GM366_IBVSP366"
 HIST_DIR = "data/curto_prazo"
 HIST_PATH = os.path.join(HIST_DIR, "ibovespa_ipea.csv")
 
+# Schema do ibovespa_ipea.parquet (gravado junto com o CSV)
+SCHEMA_HIST = (
+    pa.schema([("data", pa.date32()), ("valor", pa.float64())])
+    if pa is not None
+    else None
+)
+
+# Sessão única (keep-alive + pool) para o Ipeadata. O retry fica todo no
+# adapter (urllib3.Retry): até 3 novas tentativas em erro de rede/timeout
+# e em 429/5xx, com backoff exponencial.
+_SESSION = criar_sessao(
+    tentativas=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+)
+_SESSION.verify = False  # ver aviso de certificado acima
+
+# Cache em disco da série baixada: o Ipeadata atualiza no máximo 1x por
+# dia, então dentro desse prazo não rebaixamos o histórico inteiro.
+CACHE_TTL_SEGUNDOS = 24 * 3600
+_CACHE_IPEA = CacheDisco(DIR_CACHE_HTTP / "ipea")
+
+
+def baixar_serie_ibovespa(timeout: Tuple[int, int] = (5, 60)) -> pd.DataFrame:
+    """
+    Série completa do Ibovespa (data, valor), passando pelo cache em disco:
+    download com menos de CACHE_TTL_SEGUNDOS é reaproveitado; se o
+    download falhar (já depois dos retries da sessão), usa o último
+    arquivo salvo (se houver).
+    """
+    chave = f"ibovespa_{IBOV_SERCODIGO}"
+    df = _CACHE_IPEA.ler(chave, CACHE_TTL_SEGUNDOS)
+    if df is not None:
+        return df
+
+    try:
+        df = _baixar_serie_ibovespa_api(timeout=timeout)
+    except Exception:
+        df_antigo = _CACHE_IPEA.ler(chave, SEM_EXPIRAR)
+        if df_antigo is None:
+            raise
+        print("[Ibovespa IPEA] API indisponível; usando cache em disco.")
+        return df_antigo
+
+    _CACHE_IPEA.salvar(chave, df)
+    return df
+
 
-def baixar_serie_ibovespa(
-    timeout: Tuple[int, int] = (5, 60),
-    tentativas: int = 3,
-) -> pd.DataFrame:
+def _baixar_serie_ibovespa_api(timeout: Tuple[int, int] = (5, 60)) -> pd.DataFrame:
     """
-    Baixa a série completa do Ibovespa no Ipeadata, com retry.
+    Baixa a série completa do Ibovespa no Ipeadata.
 
     - timeout: (tempo de conexão, tempo de leitura), em segundos.
-    - tentativas: quantas vezes tenta antes de desistir.
+
+    Os retries (rede, timeout, 429/5xx) ficam no adapter da _SESSION; aqui
+    só sobe a exceção final.
 
     Retorna um DataFrame com colunas:
         - data (datetime.date)
@@ -45,66 +106,67 @@ def baixar_serie_ibovespa(
     """
     url = f"{IPEA_BASE_URL}/ValoresSerie(SERCODIGO='{IBOV_SERCODIGO}')"
 
-    ultima_exc: Optional[Exception] = None
-
-    for tentativa in range(1, tentativas + 1):
-        try:
-            print(
-                f"[Ibovespa IPEA] Tentativa {tentativa}/{tentativas} "
-                f"(timeout={timeout})..."
-            )
-            resp = requests.get(url, timeout=timeout, verify=False)
-            resp.raise_for_status()
-            payload = resp.json()
-            valores = payload.get("value", [])
-
-            if not valores:
-                raise ValueError(
-                    "Ipeadata retornou lista vazia para o Ibovespa."
-                )
-
-            registros = []
-            for item in valores:
-                data_str = item.get("VALDATA")
-                valor = item.get("VALVALOR")
-                if not data_str or valor is None:
-                    continue
-                # VALDATA vem no formato 'YYYY-MM-DDT00:00:00'
-                registros.append((data_str[:10], float(valor)))
-
-            if not registros:
-                raise ValueError(
-                    "Não há registros válidos do Ibovespa no Ipeadata."
-                )
-
-            df = pd.DataFrame(registros, columns=["data", "valor"])
-            df["data"] = pd.to_datetime(df["data"]).dt.date
-            df = df.sort_values("data").reset_index(drop=True)
-            return df
-
-        except (
-            requests.exceptions.Timeout,
-            requests.exceptions.ConnectionError,
-        ) as e:
-            # Erros de timeout / conexão: tenta de novo
-            ultima_exc = e
-            print(
-                f"[Ibovespa IPEA] Falha de rede (tentativa "
-                f"{tentativa}/{tentativas}): {e}"
-            )
-            if tentativa == tentativas:
-                print("[Ibovespa IPEA] Todas as tentativas falharam.")
-                raise
-
-        except requests.exceptions.RequestException as e:
-            # Erros HTTP 4xx/5xx ou outros problemas de request
-            print(f"[Ibovespa IPEA] Erro na requisição: {e}")
-            raise
+    try:
+        resp = _SESSION.get(url, timeout=timeout)
+        resp.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"[Ibovespa IPEA] Erro na requisição: {e}")
+        raise
+
+    payload = ler_json(resp)
+    valores = payload.get("value", [])
+
+    if not valores:
+        raise ValueError("Ipeadata retornou lista vazia para o Ibovespa.")
+
+    textos_data = [item.get("VALDATA") or "" for item in valores]
+    textos_valor = [item.get("VALVALOR") for item in valores]
+
+    # Converte direto para arrays NumPy, sem DataFrame intermediário
+    # nem o parser genérico do pandas: VALDATA vem no formato
+    # 'YYYY-MM-DDT00:00:00', e o dtype "U10" já corta no 'T' –
+    # o parser ISO de largura fixa do NumPy faz o resto. Vazio vira NaT
+    # e VALVALOR None vira NaN.
+    try:
+        datas = np.array(textos_data, dtype="U10").astype("datetime64[D]")
+        fechamentos = np.array(textos_valor, dtype=np.float64)
+    except (TypeError, ValueError):
+        # alguma data/valor malformado: o NumPy não tem "coerce", então
+        # volta para o pandas, que descarta só as linhas ruins
+        datas = pd.to_datetime(
+            pd.Series(textos_data, dtype=object).str.slice(0, 10),
+            format="%Y-%m-%d",
+            errors="coerce",
+        ).to_numpy()
+        fechamentos = pd.to_numeric(
+            pd.Series(textos_valor, dtype=object), errors="coerce"
+        ).to_numpy(dtype=np.float64)
+
+    validos = ~np.isnat(datas) & ~np.isnan(fechamentos)
+    df = pd.DataFrame({"data": datas[validos], "valor": fechamentos[validos]})
+
+    if df.empty:
+        raise ValueError("Não há registros válidos do Ibovespa no Ipeadata.")
+
+    df = df.sort_values("data", kind="stable").reset_index(drop=True)
+    df["data"] = df["data"].dt.date
+    return df
 
-    # Segurança: se chegar aqui sem retorno
-    if ultima_exc:
-        raise ultima_exc
-    raise RuntimeError("Falha inesperada ao baixar série do Ibovespa.")
+
+def _ler_csv_historico(caminho: str) -> pd.DataFrame:
+    """
+    Lê o CSV do histórico (data ISO 'YYYY-MM-DD', valor) com formato de
+    data explícito: o parser vai direto pelo caminho rápido em C, sem
+    tentar adivinhar o formato linha a linha. Devolve `data` como date.
+    """
+    df = pd.read_csv(
+        caminho,
+        dtype={"valor": "float64"},
+        parse_dates=["data"],
+        date_format="%Y-%m-%d",
+    )
+    df["data"] = df["data"].dt.date
+    return df
 
 
 def atualizar_historico_ibovespa(caminho: str = HIST_PATH) -> pd.DataFrame:
@@ -122,8 +184,7 @@ def atualizar_historico_ibovespa(caminho: str = HIST_PATH) -> pd.DataFrame:
 
     # Carrega histórico antigo (se existir)
     if os.path.exists(caminho) and os.path.getsize(caminho) > 0:
-        df_old = pd.read_csv(caminho, parse_dates=["data"])
-        df_old["data"] = df_old["data"].dt.date
+        df_old = _ler_csv_historico(caminho)
     else:
         df_old = pd.DataFrame(columns=df_novo.columns)
 
@@ -150,6 +211,8 @@ def atualizar_historico_ibovespa(caminho: str = HIST_PATH) -> pd.DataFrame:
 
     # Salva em disco
     df.to_csv(caminho, index=False, encoding="utf-8")
+    if SCHEMA_HIST is not None and set(SCHEMA_HIST.names) == set(df.columns):
+        salvar_parquet_irmao(df, caminho, schema=SCHEMA_HIST)
 
     return df
 
@@ -157,12 +220,16 @@ def atualizar_historico_ibovespa(caminho: str = HIST_PATH) -> pd.DataFrame:
 def carregar_historico_ibovespa(caminho: str = HIST_PATH) -> pd.DataFrame:
     """
     Carrega o histórico local do Ibovespa salvo em CSV.
+
+    Prefere o .parquet gravado junto com o CSV (já tipado); cai no CSV
+    se o parquet não existir ou estiver desatualizado.
     """
     if not os.path.exists(caminho) or os.path.getsize(caminho) == 0:
         raise FileNotFoundError(f"Histórico do Ibovespa não encontrado em {caminho}")
 
-    df = pd.read_csv(caminho, parse_dates=["data"])
-    df["data"] = df["data"].dt.date
+    df = ler_parquet_irmao(caminho)
+    if df is None:
+        df = _ler_csv_historico(caminho)
     df = df.sort_values("data").reset_index(drop=True)
     return df
 
@@ -1,7 +1,10 @@
 # indicadores_macro_br.py
 # -*- coding: utf-8 -*-
 
+import hashlib
 import math
+import re
+import numpy as np
 import streamlit_shadcn_ui as ui
 import altair as alt
 import requests
@@ -10,9 +13,13 @@ import unicodedata
 from datetime import datetime, date, timedelta
 from dateutil.relativedelta import relativedelta
 import streamlit as st
-from typing import Optional, Dict, List, Tuple
+import threading
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from typing import Callable, Optional, Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from pathlib import Path
+from urllib.parse import quote, urlencode
 from dados_macro_fiscal_br import carregar_dados_macro_fiscal_br
 from bloco_curto_prazo_br import (
     render_bloco_curto_prazo_br,
@@ -24,7 +31,15 @@ from bloco_curto_prazo_br import (
     _format_delta_br,
 )
 
-from dados_curto_prazo_br import carregar_dados_curto_prazo_br
+from dados_curto_prazo_br import (
+    carregar_dados_curto_prazo_br,
+    _chave_disco_sgs,
+    _corte_anos,
+    _data_str_anos_atras,
+    _df_somente_leitura,
+    _ensure_sorted,
+    _indice_corte,
+)
 
 from curvas_anbima import (
     atualizar_todas_as_curvas,
@@ -34,6 +49,7 @@ from curvas_anbima import (
 from di_futuro_b3 import (
     atualizar_historico_di_futuro,
     carregar_historico_di_futuro,
+    converter_vencimentos,
 )
 
 from ibovespa_ipea import (
@@ -54,6 +70,13 @@ from analise_tesouro_vs_curva import (
     comparar_tesouro_ipca_vs_curva,
 )
 from tesouro_direto import carregar_tesouro_ultimo_dia
+from sessao_http import criar_sessao, ler_json
+from cache_disco import (
+    DIR_CACHE_HTTP,
+    CacheDisco,
+    invalidar_cache_disco,
+    ler_ou_baixar,
+)
 import logging
 
 
@@ -89,6 +112,13 @@ def load_theme_css() -> None:
 # HELPER DE REDE COM RETRY
 # =============================================================================
 
+# Sessão única (keep-alive + pool) para BCB (SGS/Olinda), IBGE (SIDRA) e
+# B3: cada refresh do painel reaproveita as conexões TLS já abertas. Sem
+# retry no adapter: _get_with_retry tem o próprio laço (max_attempts).
+# Todas essas APIs respondem JSON: o Accept deixa isso explícito (o
+# Accept-Encoding com gzip e o keep-alive já vêm do criar_sessao/requests).
+_HTTP = criar_sessao(tentativas=0, headers={"Accept": "application/json"})
+
 
 def _get_with_retry(
     url: str,
@@ -104,7 +134,7 @@ def _get_with_retry(
 
     for attempt in range(1, max_attempts + 1):
         try:
-            resp = requests.get(url, timeout=timeout)
+            resp = _HTTP.get(url, timeout=timeout)
             resp.raise_for_status()
             return resp
         except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
@@ -180,26 +210,19 @@ FOCUS_MENSAIS_CACHE_FILE = FOCUS_CACHE_DIR / "focus_expectativas_mensais.csv"
 # =============================================================================
 
 
+# As datas saem de _data_str_anos_atras (dados_curto_prazo_br), cacheada
+# pelo ordinal do dia: o relativedelta + strftime roda uma vez por dia e
+# as chaves dos lru_cache do SGS ficam estáveis ao longo do dia.
+
+
 def _hoje_str() -> str:
     """Data de hoje em dd/mm/aaaa (usado no BCB)."""
-    return date.today().strftime("%d/%m/%Y")
+    return _data_str_anos_atras(date.today().toordinal(), 0)
 
 
 def _um_ano_atras_str() -> str:
     """Data de 1 ano atrás em dd/mm/aaaa."""
-    dt = date.today() - relativedelta(years=1)
-    return dt.strftime("%d/%m/%Y")
-
-
-def _dois_anos_atras_str() -> str:
-    """Data de 2 anos atrás em dd/mm/aaaa."""
-    dt = date.today() - relativedelta(years=2)
-    return dt.strftime("%d/%m/%Y")
-
-def _quatro_anos_atras_str() -> str:
-    """Data de 4 anos atrás em dd/mm/aaaa."""
-    dt = date.today() - relativedelta(years=4)
-    return dt.strftime("%d/%m/%Y")
+    return _data_str_anos_atras(date.today().toordinal(), 1)
 
 
 def _formata_mes(dt: pd.Timestamp) -> str:
@@ -228,11 +251,119 @@ def _parse_periodo(p: str) -> pd.Timestamp:
         return pd.NaT
 
 
+def _texto_para_float(valores: pd.Series) -> pd.Series:
+    """
+    Coluna de números em texto (vírgula ou ponto decimal) -> float; o que
+    não for número ("...", "-") vira NaN. SGS/SIDRA já mandam texto, então
+    o astype(str) só roda se a coluna tiver outra coisa; a troca da
+    vírgula é literal (regex=False).
+    """
+    if pd.api.types.infer_dtype(valores, skipna=True) != "string":
+        valores = valores.astype(str)
+    return pd.to_numeric(valores.str.replace(",", ".", regex=False), errors="coerce")
+
+
+def _parse_periodos(periodos: pd.Series) -> pd.Series:
+    """
+    Versão vetorizada de _parse_periodo para uma coluna inteira.
+
+    O caso comum do SIDRA (todos os códigos 'AAAAMM') vira uma única
+    chamada de pd.to_datetime com formato fixo; códigos em outro formato
+    são convertidos à parte (format="mixed"). O que não for data vira NaT.
+    """
+    codigos = periodos.astype(str).str.strip()
+    aaaamm = codigos.str.fullmatch(r"\d{6}")
+
+    datas = pd.to_datetime(codigos.where(aaaamm), format="%Y%m", errors="coerce")
+    if not aaaamm.all():
+        outros = ~aaaamm
+        datas[outros] = pd.to_datetime(
+            codigos[outros], format="mixed", errors="coerce"
+        )
+    return datas
+
+
+# Título de coluna do SIDRA que indica o período ("Mês (Código)", "Mês",
+# "Período"...), compilado uma vez para todas as respostas.
+_RE_TITULO_PERIODO = re.compile(r"m[eê]s|per[ií]odo", re.IGNORECASE)
+
+
+def _coluna_periodo_sidra(header: Dict[str, str]) -> str:
+    """
+    Descobre a coluna de período a partir da linha de cabeçalho do SIDRA:
+    a primeira cujo título fala em mês/período (no layout padrão é a D2C,
+    "Mês (Código)"). Sem nenhuma, cai em D3C, D2C ou na primeira coluna.
+
+    O título é testado antes de D3C/D2C de propósito: no layout padrão a
+    D3C é a "Variável (Código)", não o período.
+    """
+    for col, titulo in header.items():
+        if _RE_TITULO_PERIODO.search(str(titulo)):
+            return col
+    if "D3C" in header:
+        return "D3C"
+    if "D2C" in header:
+        return "D2C"
+    return next(iter(header))
+
+
+def _serie_sidra_de_json(dados: List[Dict[str, str]]) -> pd.DataFrame:
+    """
+    Converte a resposta JSON do SIDRA (1ª linha = cabeçalho) em
+    ['data', 'valor'], ordenado por data, sem NaN e com uma linha por data
+    (fica a última que veio da API).
+
+    Uma passada nas linhas pegando só período e valor ("V", coluna padrão
+    SIDRA): as demais colunas (D1C/D1N/D2C/...) nem viram DataFrame.
+    """
+    if not dados or len(dados) < 2:
+        return pd.DataFrame(columns=["data", "valor"])
+
+    header = dados[0]
+    linhas = dados[1:]
+    col_periodo = _coluna_periodo_sidra(header)
+
+    periodos = [linha.get(col_periodo) for linha in linhas]
+    valores = [linha.get("V") for linha in linhas]
+    df = pd.DataFrame(
+        {
+            "data": _parse_periodos(pd.Series(periodos, dtype=object)),
+            "valor": _texto_para_float(pd.Series(valores, dtype=object)),
+        }
+    )
+    df = df.dropna().sort_values("data", kind="stable")
+
+    # datas já ordenadas: repetida é a que tem a mesma data na linha
+    # seguinte (fica a última de cada bloco); sem hashtable
+    datas = df["data"].to_numpy()
+    manter = np.ones(len(datas), dtype=bool)
+    manter[:-1] = datas[:-1] != datas[1:]
+    return df[manter].reset_index(drop=True)
+
+
 # =============================================================================
 # BANCO CENTRAL (SGS) – FUNÇÃO GENÉRICA COM CACHE + RETRY
 # =============================================================================
 
 
+# Cache em disco (Parquet) na frente das APIs: um processo novo do
+# Streamlit reaproveita o que já foi baixado. O lru_cache continua na
+# frente como L1 em memória. TTL por fonte, de acordo com a frequência de
+# atualização: SGS (diárias) 6h; SIDRA (mensais) 24h.
+CACHE_TTL_SGS_SEGUNDOS = 6 * 3600
+CACHE_TTL_SIDRA_SEGUNDOS = 24 * 3600
+_CACHE_SGS = CacheDisco(DIR_CACHE_HTTP / "sgs")
+_CACHE_SIDRA = CacheDisco(DIR_CACHE_HTTP / "sidra")
+
+
+def _chave_disco_url(url: str) -> str:
+    """
+    Chave do cache em disco para uma URL: hash md5 (nome curto e sem
+    colisões, ao contrário da URL "limpa" por regex no nome do arquivo).
+    """
+    return "url_" + hashlib.md5(url.encode("utf-8")).hexdigest()
+
+
 @lru_cache(maxsize=32)
 def _buscar_serie_sgs_cached(
     codigo: int,
@@ -240,25 +371,47 @@ def _buscar_serie_sgs_cached(
     data_final: Optional[str],
 ) -> pd.DataFrame:
     """
-    Implementação interna com cache. Não chame diretamente;
-    use buscar_serie_sgs().
+    Implementação interna com cache (memória + disco). Não chame
+    diretamente; use buscar_serie_sgs().
     """
+    df = ler_ou_baixar(
+        _CACHE_SGS,
+        _chave_disco_sgs(codigo, data_inicial, data_final),
+        CACHE_TTL_SGS_SEGUNDOS,
+        _baixar_serie_sgs,
+        codigo,
+        data_inicial,
+        data_final,
+    )
+    return _df_somente_leitura(df)
+
+
+def _baixar_serie_sgs(
+    codigo: int,
+    data_inicial: Optional[str],
+    data_final: Optional[str],
+) -> pd.DataFrame:
+    """Baixa a série do SGS no intervalo e devolve ['data', 'valor']."""
     url = (
         f"https://api.bcb.gov.br/dados/serie/bcdata.sgs.{codigo}/dados"
         f"?formato=json&dataInicial={data_inicial}&dataFinal={data_final}"
     )
 
     resp = _get_with_retry(url)  # usa os defaults: 2 tentativas, 10s
-    dados = resp.json()
+    dados = ler_json(resp)
 
     if not dados:
         return pd.DataFrame(columns=["data", "valor"])
 
-    df = pd.DataFrame(dados)
-    df["data"] = pd.to_datetime(df["data"], format="%d/%m/%Y")
-    df["valor"] = pd.to_numeric(
-        df["valor"].astype(str).str.replace(",", "."),
-        errors="coerce",
+    # monta as duas colunas direto da lista de dicts (sem o pandas ter de
+    # inferir colunas linha a linha)
+    datas = [d["data"] for d in dados]
+    valores = [d["valor"] for d in dados]
+    df = pd.DataFrame(
+        {
+            "data": pd.to_datetime(datas, format="%d/%m/%Y"),
+            "valor": _texto_para_float(pd.Series(valores, dtype=object)),
+        }
     )
     df = df.sort_values("data").reset_index(drop=True)
     return df
@@ -272,12 +425,28 @@ def buscar_serie_sgs(
     """
     Busca série temporal na API SGS do Banco Central.
     Retorna DataFrame com colunas ['data', 'valor'].
+
+    ATENÇÃO: o retorno é o próprio objeto do cache e é IMUTÁVEL
+    (arrays somente leitura). Quem precisar alterar os dados in-place
+    deve chamar .copy() antes.
     """
     if data_inicial is None:
         data_inicial = _um_ano_atras_str()
     if data_final is None:
         data_final = _hoje_str()
-    return _buscar_serie_sgs_cached(codigo, data_inicial, data_final).copy()
+    return _buscar_serie_sgs_cached(codigo, data_inicial, data_final)
+
+
+def _buscar_serie_sgs_anos(codigo: int, anos: int) -> pd.DataFrame:
+    """
+    Série do SGS nos últimos `anos` anos até hoje. As duas pontas saem do
+    mesmo ordinal do dia: a chave do cache (codigo, início, fim) é uma só
+    por dia, mesmo que a chamada atravesse a meia-noite.
+    """
+    hoje = date.today().toordinal()
+    return _buscar_serie_sgs_cached(
+        codigo, _data_str_anos_atras(hoje, anos), _data_str_anos_atras(hoje, 0)
+    )
 
 
 def buscar_selic_meta_aa() -> pd.DataFrame:
@@ -309,29 +478,17 @@ def buscar_selic_meta_aa() -> pd.DataFrame:
             pass
 
     # 2) Fallback: busca na API SGS (comportamento antigo)
-    return buscar_serie_sgs(
-        SGS_SERIES["selic_meta_aa"],
-        data_inicial=_quatro_anos_atras_str(),
-        data_final=_hoje_str(),
-    )
+    return _buscar_serie_sgs_anos(SGS_SERIES["selic_meta_aa"], 4)
 
 
 def buscar_cdi_diario() -> pd.DataFrame:
     """CDI diário (% a.d.), últimos 2 anos de dados."""
-    return buscar_serie_sgs(
-        SGS_SERIES["cdi_diario"],
-        data_inicial=_dois_anos_atras_str(),
-        data_final=_hoje_str(),
-    )
+    return _buscar_serie_sgs_anos(SGS_SERIES["cdi_diario"], 2)
 
 
 def buscar_ptax_venda() -> pd.DataFrame:
     """Dólar PTAX - venda (R$/US$). Usa janela de 2 anos para variações."""
-    return buscar_serie_sgs(
-        SGS_SERIES["ptax_venda"],
-        data_inicial=_dois_anos_atras_str(),
-        data_final=_hoje_str(),
-    )
+    return _buscar_serie_sgs_anos(SGS_SERIES["ptax_venda"], 2)
 
 
 # =============================================================================
@@ -344,10 +501,35 @@ def _buscar_serie_mensal_ibge_cached(
     tabela: int,
     variavel: int,
     nivel: str,
+    dia: int,
+) -> pd.DataFrame:
+    """
+    Implementação interna com cache (memória + disco). Não chame
+    diretamente; use buscar_serie_mensal_ibge().
+
+    `dia` (date.today().toordinal()) só entra na chave do lru_cache: num
+    processo que fica no ar vários dias, a entrada em memória vence na
+    virada do dia e a próxima chamada volta ao cache em disco (TTL 24h).
+    """
+    df = ler_ou_baixar(
+        _CACHE_SIDRA,
+        f"t{tabela}_{nivel}_v{variavel}_last60",
+        CACHE_TTL_SIDRA_SEGUNDOS,
+        _baixar_serie_mensal_ibge,
+        tabela,
+        variavel,
+        nivel,
+    )
+    return _df_somente_leitura(df)
+
+
+def _baixar_serie_mensal_ibge(
+    tabela: int,
+    variavel: int,
+    nivel: str,
 ) -> pd.DataFrame:
     """
-    Implementação interna com cache. Não chame diretamente;
-    use buscar_serie_mensal_ibge().
+    Baixa a série mensal no SIDRA e devolve ['data', 'valor'].
 
     IMPORTANTE:
     - Usa p/last60 (últimos 60 meses), e não p/all,
@@ -359,50 +541,7 @@ def _buscar_serie_mensal_ibge_cached(
     )
 
     resp = _get_with_retry(url)  # usa os defaults: 2 tentativas, 10s
-    dados = resp.json()
-
-    if not dados:
-        return pd.DataFrame(columns=["data", "valor"])
-
-    header = dados[0]
-    linhas = dados[1:]
-    df = pd.DataFrame(linhas)
-
-    # Descobre coluna de período (mais robusto)
-    col_periodo = None
-    for col in df.columns:
-        titulo = str(header.get(col, "")).lower()
-        if any(
-            p in titulo
-            for p in ["mês (código)", "mes (código)", "mês", "mes", "período", "periodo"]
-        ):
-            col_periodo = col
-            break
-
-    if col_periodo is None:
-        if "D3C" in df.columns:
-            col_periodo = "D3C"
-        elif "D2C" in df.columns:
-            col_periodo = "D2C"
-        else:
-            col_periodo = df.columns[0]
-
-    col_valor = "V"  # coluna padrão SIDRA
-
-    df["data"] = df[col_periodo].apply(_parse_periodo)
-    df["valor"] = pd.to_numeric(
-        df[col_valor].astype(str).str.replace(",", "."),
-        errors="coerce",
-    )
-
-    df = (
-        df[["data", "valor"]]
-        .dropna()
-        .sort_values("data")
-        .drop_duplicates(subset=["data"], keep="last")
-        .reset_index(drop=True)
-    )
-    return df
+    return _serie_sidra_de_json(ler_json(resp))
 
 
 def buscar_serie_mensal_ibge(
@@ -412,9 +551,12 @@ def buscar_serie_mensal_ibge(
 ) -> pd.DataFrame:
     """
     Busca uma série mensal simples na API SIDRA do IBGE.
-    Retorna DataFrame com ['data', 'valor'].
+    Retorna DataFrame com ['data', 'valor'], imutável (mesmo contrato de
+    buscar_serie_sgs).
     """
-    return _buscar_serie_mensal_ibge_cached(tabela, variavel, nivel).copy()
+    return _buscar_serie_mensal_ibge_cached(
+        tabela, variavel, nivel, date.today().toordinal()
+    )
 
 
 def buscar_ipca_ibge() -> pd.DataFrame:
@@ -433,60 +575,33 @@ def buscar_ipca15_ibge() -> pd.DataFrame:
 
 
 @lru_cache(maxsize=128)
-def _buscar_serie_sidra_valor_cached(url: str) -> pd.DataFrame:
+def _buscar_serie_sidra_valor_cached(url: str, dia: int) -> pd.DataFrame:
     """
     Helper genérico: busca uma série na API do SIDRA
     e devolve DataFrame ['data', 'valor'].
-    Implementação com cache.
+    Implementação com cache (memória + disco, chave = hash da URL); `dia` só
+    renova a entrada em memória a cada dia (ver
+    _buscar_serie_mensal_ibge_cached).
     """
-    resp = _get_with_retry(url)  # usa os defaults: 2 tentativas, 10s
-    dados = resp.json()
-
-    if not dados:
-        return pd.DataFrame(columns=["data", "valor"])
-
-    header = dados[0]
-    linhas = dados[1:]
-    df = pd.DataFrame(linhas)
-
-    # Detecta coluna de período de forma robusta
-    col_periodo = None
-    for col in df.columns:
-        titulo = str(header.get(col, "")).lower()
-        if any(
-            p in titulo
-            for p in ["mês (código)", "mes (código)", "mês", "mes", "período", "periodo"]
-        ):
-            col_periodo = col
-            break
-
-    if col_periodo is None:
-        if "D3C" in df.columns:
-            col_periodo = "D3C"
-        elif "D2C" in df.columns:
-            col_periodo = "D2C"
-        else:
-            col_periodo = df.columns[0]
-
-    df["data"] = df[col_periodo].apply(_parse_periodo)
-    df["valor"] = pd.to_numeric(
-        df["V"].astype(str).str.replace(",", "."),
-        errors="coerce",
+    df = ler_ou_baixar(
+        _CACHE_SIDRA,
+        _chave_disco_url(url),
+        CACHE_TTL_SIDRA_SEGUNDOS,
+        _baixar_serie_sidra_valor,
+        url,
     )
+    return _df_somente_leitura(df)
 
-    df = (
-        df[["data", "valor"]]
-        .dropna()
-        .sort_values("data")
-        .drop_duplicates(subset=["data"], keep="last")
-        .reset_index(drop=True)
-    )
-    return df
+
+def _baixar_serie_sidra_valor(url: str) -> pd.DataFrame:
+    """Baixa a série do SIDRA na `url` e devolve ['data', 'valor']."""
+    resp = _get_with_retry(url)  # usa os defaults: 2 tentativas, 10s
+    return _serie_sidra_de_json(ler_json(resp))
 
 
 def _buscar_serie_sidra_valor(url: str) -> pd.DataFrame:
-    """Wrapper sem cache mutável (retorna cópia)."""
-    return _buscar_serie_sidra_valor_cached(url).copy()
+    """Wrapper do cache; o retorno é imutável (ver buscar_serie_sgs)."""
+    return _buscar_serie_sidra_valor_cached(url, date.today().toordinal())
 
 
 # =============================================================================
@@ -494,76 +609,59 @@ def _buscar_serie_sidra_valor(url: str) -> pd.DataFrame:
 # =============================================================================
 
 
-def buscar_pmc_var_mom_ajustada() -> pd.DataFrame:
-    url = (
+def _url_sidra_variacao(
+    tabela: int,
+    variavel: int,
+    classificacao: int,
+    categoria: int,
+) -> str:
+    """
+    URL do SIDRA (Brasil, últimos 60 meses, 1 casa decimal) para uma
+    variável de PMC/PMS/PIM filtrada por uma categoria de classificação.
+    Um único formato de URL: a chave dos caches (memória e disco) é
+    sempre a mesma para a mesma série.
+    """
+    return (
         "https://apisidra.ibge.gov.br/values/"
-        "t/8880/n1/all/v/11708/p/last60/c11046/56734/d/v11708%201"
+        f"t/{tabela}/n1/all/v/{variavel}/p/last60"
+        f"/c{classificacao}/{categoria}/d/v{variavel}%201"
     )
-    return _buscar_serie_sidra_valor(url)
+
+
+def buscar_pmc_var_mom_ajustada() -> pd.DataFrame:
+    return _buscar_serie_sidra_valor(_url_sidra_variacao(8880, 11708, 11046, 56734))
 
 
 def buscar_pmc_var_acum_ano() -> pd.DataFrame:
-    url = (
-        "https://apisidra.ibge.gov.br/values/"
-        "t/8880/n1/all/v/11710/p/last60/c11046/56734/d/v11710%201"
-    )
-    return _buscar_serie_sidra_valor(url)
+    return _buscar_serie_sidra_valor(_url_sidra_variacao(8880, 11710, 11046, 56734))
 
 
 def buscar_pmc_var_acum_12m() -> pd.DataFrame:
-    url = (
-        "https://apisidra.ibge.gov.br/values/"
-        "t/8880/n1/all/v/11711/p/last60/c11046/56734/d/v11711%201"
-    )
-    return _buscar_serie_sidra_valor(url)
+    return _buscar_serie_sidra_valor(_url_sidra_variacao(8880, 11711, 11046, 56734))
 
 
 def buscar_pms_var_mom_ajustada() -> pd.DataFrame:
-    url = (
-        "https://apisidra.ibge.gov.br/values/"
-        "t/5906/n1/all/v/11623/p/last60/c11046/56726/d/v11623%201"
-    )
-    return _buscar_serie_sidra_valor(url)
+    return _buscar_serie_sidra_valor(_url_sidra_variacao(5906, 11623, 11046, 56726))
 
 
 def buscar_pms_var_acum_ano() -> pd.DataFrame:
-    url = (
-        "https://apisidra.ibge.gov.br/values/"
-        "t/5906/n1/all/v/11625/p/last60/c11046/56726/d/v11625%201"
-    )
-    return _buscar_serie_sidra_valor(url)
+    return _buscar_serie_sidra_valor(_url_sidra_variacao(5906, 11625, 11046, 56726))
 
 
 def buscar_pms_var_acum_12m() -> pd.DataFrame:
-    url = (
-        "https://apisidra.ibge.gov.br/values/"
-        "t/5906/n1/all/v/11626/p/last60/c11046/56726/d/v11626%201"
-    )
-    return _buscar_serie_sidra_valor(url)
+    return _buscar_serie_sidra_valor(_url_sidra_variacao(5906, 11626, 11046, 56726))
 
 
 def buscar_pim_var_mom_ajustada() -> pd.DataFrame:
-    url = (
-        "https://apisidra.ibge.gov.br/values/"
-        "t/8888/n1/all/v/11601/p/last60/c544/129314/d/v11601%201"
-    )
-    return _buscar_serie_sidra_valor(url)
+    return _buscar_serie_sidra_valor(_url_sidra_variacao(8888, 11601, 544, 129314))
 
 
 def buscar_pim_var_acum_ano() -> pd.DataFrame:
-    url = (
-        "https://apisidra.ibge.gov.br/values/"
-        "t/8888/n1/all/v/11603/p/last60/c544/129314/d/v11603%201"
-    )
-    return _buscar_serie_sidra_valor(url)
+    return _buscar_serie_sidra_valor(_url_sidra_variacao(8888, 11603, 544, 129314))
 
 
 def buscar_pim_var_acum_12m() -> pd.DataFrame:
-    url = (
-        "https://apisidra.ibge.gov.br/values/"
-        "t/8888/n1/all/v/11604/p/last60/c544/129314/d/v11604%201"
-    )
-    return _buscar_serie_sidra_valor(url)
+    return _buscar_serie_sidra_valor(_url_sidra_variacao(8888, 11604, 544, 129314))
 
 
 # =============================================================================
@@ -593,13 +691,21 @@ def _resumo_triple_series(
 
     ref_mes = _formata_mes(data_ref)
 
+    alvo = data_ref.to_datetime64()
+
     def _pega_valor(df: pd.DataFrame) -> float:
+        """Valor na data de referência (ou o último, se ela não existir)."""
         if df.empty:
             return float("nan")
-        linha = df[df["data"] == data_ref]
-        if linha.empty:
-            linha = df.iloc[[-1]]
-        return float(linha.iloc[0]["valor"])
+        # caso comum: as três séries terminam no mesmo mês
+        if df["data"].iat[-1] == data_ref:
+            return float(df["valor"].iat[-1])
+        df = _ensure_sorted(df)
+        datas = df["data"].to_numpy()
+        i = int(datas.searchsorted(alvo))
+        if i == len(datas) or datas[i] != alvo:
+            i = -1
+        return float(df["valor"].iat[i])
 
     var_mensal = _pega_valor(df_mom)
     acum_ano = _pega_valor(df_ano)
@@ -613,25 +719,45 @@ def _resumo_triple_series(
     }
 
 
+def _resumo_triple_em_paralelo(
+    buscar_mom: Callable[[], pd.DataFrame],
+    buscar_ano: Callable[[], pd.DataFrame],
+    buscar_12: Callable[[], pd.DataFrame],
+) -> Dict[str, float]:
+    """
+    Dispara as três buscas no SIDRA ao mesmo tempo (são independentes e o
+    requests libera o GIL no I/O) e monta o resumo. Erro em qualquer uma
+    sobe para o chamador, como na versão sequencial.
+    """
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        fut_mom = pool.submit(buscar_mom)
+        fut_ano = pool.submit(buscar_ano)
+        fut_12 = pool.submit(buscar_12)
+    return _resumo_triple_series(fut_mom.result(), fut_ano.result(), fut_12.result())
+
+
 def resumo_pmc_oficial() -> Dict[str, float]:
-    df_mom = buscar_pmc_var_mom_ajustada()
-    df_ano = buscar_pmc_var_acum_ano()
-    df_12 = buscar_pmc_var_acum_12m()
-    return _resumo_triple_series(df_mom, df_ano, df_12)
+    return _resumo_triple_em_paralelo(
+        buscar_pmc_var_mom_ajustada,
+        buscar_pmc_var_acum_ano,
+        buscar_pmc_var_acum_12m,
+    )
 
 
 def resumo_pms_oficial() -> Dict[str, float]:
-    df_mom = buscar_pms_var_mom_ajustada()
-    df_ano = buscar_pms_var_acum_ano()
-    df_12 = buscar_pms_var_acum_12m()
-    return _resumo_triple_series(df_mom, df_ano, df_12)
+    return _resumo_triple_em_paralelo(
+        buscar_pms_var_mom_ajustada,
+        buscar_pms_var_acum_ano,
+        buscar_pms_var_acum_12m,
+    )
 
 
 def resumo_pim_oficial() -> Dict[str, float]:
-    df_mom = buscar_pim_var_mom_ajustada()
-    df_ano = buscar_pim_var_acum_ano()
-    df_12 = buscar_pim_var_acum_12m()
-    return _resumo_triple_series(df_mom, df_ano, df_12)
+    return _resumo_triple_em_paralelo(
+        buscar_pim_var_mom_ajustada,
+        buscar_pim_var_acum_ano,
+        buscar_pim_var_acum_12m,
+    )
 
 
 # =============================================================================
@@ -640,10 +766,17 @@ def resumo_pim_oficial() -> Dict[str, float]:
 
 
 def _acumula_percentuais(valores: pd.Series) -> float:
-    if valores.empty:
+    """
+    Acumula variações % (compostas): (prod(1 + v/100) - 1) * 100.
+
+    Feito em espaço log (log1p/expm1) direto no array: não perde precisão
+    em janelas longas e evita a maquinaria do Series.prod(). NaN é
+    ignorado, como no prod() do pandas.
+    """
+    arr = np.asarray(valores, dtype=np.float64)
+    if arr.size == 0:
         return float("nan")
-    fator = (1 + valores / 100).prod()
-    return (fator - 1) * 100.0
+    return float(np.expm1(np.nansum(np.log1p(arr / 100.0))) * 100.0)
 
 
 def resumo_inflacao(df: pd.DataFrame) -> Dict[str, float]:
@@ -655,12 +788,13 @@ def resumo_inflacao(df: pd.DataFrame) -> Dict[str, float]:
             "acum_12m": float("nan"),
         }
 
-    df = df.sort_values("data").reset_index(drop=True)
-    ult = df.iloc[-1]
-    ref_mes = _formata_mes(ult["data"])
-    ultimo_valor = ult["valor"]
+    # as séries do cache já vêm ordenadas: só reordena se precisar
+    df = _ensure_sorted(df)
+    ultima_data = df["data"].iat[-1]
+    ref_mes = _formata_mes(ultima_data)
+    ultimo_valor = df["valor"].iat[-1]
 
-    ano_ref = ult["data"].year
+    ano_ref = ultima_data.year
     df_ano = df[df["data"].dt.year == ano_ref]
 
     if not df_ano.empty:
@@ -713,15 +847,20 @@ def _carregar_focus_mensais_raw() -> pd.DataFrame:
             pass
 
     # 2) Baixa da API OLINDA
-    url = (
-        f"{FOCUS_MENSAIS_URL}"
-        "?$format=json"
-        "&$top=50000"
-    )
+    # Só as colunas usadas no painel (o endpoint manda também Media,
+    # DesvioPadrao, Minimo, Maximo...) e as coletas mais recentes
+    # primeiro: o $top corta o histórico antigo, não a semana atual.
+    params = {
+        "$format": "json",
+        "$top": "50000",
+        "$orderby": "Data desc",
+        "$select": "Indicador,Data,DataReferencia,Mediana",
+    }
+    url = f"{FOCUS_MENSAIS_URL}?{urlencode(params, safe='$,', quote_via=quote)}"
 
     try:
         resp = _get_with_retry(url)
-        dados_json = resp.json()
+        dados_json = ler_json(resp)
         dados = dados_json.get("value", [])
     except Exception:
         return pd.DataFrame()
@@ -990,55 +1129,38 @@ def resumo_cambio(df: pd.DataFrame) -> Dict[str, Optional[float]]:
             "var_24m": None,
         }
 
-    df = df.sort_values("data").reset_index(drop=True)
+    # as séries do cache já vêm ordenadas: só reordena se precisar
+    df = _ensure_sorted(df)
+
+    ultima_data = df["data"].iat[-1]
+    ultimo_valor = df["valor"].iat[-1]
 
-    ult = df.iloc[-1]
-    ultima_data = ult["data"]
-    ultimo_valor = ult["valor"]
+    # A série está ordenada: cada base é a primeira observação >= corte,
+    # achada por busca binária (sem máscara booleana nem sub-DataFrame).
+    # A última observação está dentro de todas as janelas, então os
+    # índices são sempre válidos.
+    datas = df["data"].to_numpy()
+    valores = df["valor"]
 
     # ---------- Variação no ano ----------
-    ano_ref = ultima_data.year
-    df_ano = df[df["data"].dt.year == ano_ref]
-    if not df_ano.empty:
-        inicio_ano = df_ano.iloc[0]["valor"]
-        var_ano = (ultimo_valor / inicio_ano - 1.0) * 100.0
-    else:
-        var_ano = None
+    i_ano = _indice_corte(datas, date(ultima_data.year, 1, 1))
+    var_ano = (ultimo_valor / valores.iat[i_ano] - 1.0) * 100.0
 
     # ---------- Variação no mês ----------
-    mes_ref = ultima_data.month
-    df_mes = df[
-        (df["data"].dt.year == ano_ref) & (df["data"].dt.month == mes_ref)
-    ]
-    if not df_mes.empty:
-        inicio_mes = df_mes.iloc[0]["valor"]
-        var_mes = (ultimo_valor / inicio_mes - 1.0) * 100.0
-    else:
-        var_mes = None
+    i_mes = _indice_corte(datas, date(ultima_data.year, ultima_data.month, 1))
+    var_mes = (ultimo_valor / valores.iat[i_mes] - 1.0) * 100.0
 
     # ---------- Variação em 12 meses ----------
-    corte_12m = ultima_data - relativedelta(years=1)
-    df_12m = df[df["data"] >= corte_12m]
-    if not df_12m.empty:
-        valor_12m = df_12m.iloc[0]["valor"]
-        data_12m = df_12m.iloc[0]["data"]
-        var_12m = (ultimo_valor / valor_12m - 1) * 100.0
-    else:
-        valor_12m = None
-        data_12m = None
-        var_12m = None
+    i_12m = _indice_corte(datas, _corte_anos(ultima_data, 1))
+    valor_12m = valores.iat[i_12m]
+    data_12m = pd.Timestamp(datas[i_12m])
+    var_12m = (ultimo_valor / valor_12m - 1) * 100.0
 
     # ---------- Variação em 24 meses ----------
-    corte_24m = ultima_data - relativedelta(years=2)
-    df_24m = df[df["data"] >= corte_24m]
-    if not df_24m.empty:
-        valor_24m = df_24m.iloc[0]["valor"]
-        data_24m = df_24m.iloc[0]["data"]
-        var_24m = (ultimo_valor / valor_24m - 1) * 100.0
-    else:
-        valor_24m = None
-        data_24m = None
-        var_24m = None
+    i_24m = _indice_corte(datas, _corte_anos(ultima_data, 2))
+    valor_24m = valores.iat[i_24m]
+    data_24m = pd.Timestamp(datas[i_24m])
+    var_24m = (ultimo_valor / valor_24m - 1) * 100.0
 
     return {
         "ultimo": ultimo_valor,
@@ -1078,6 +1200,22 @@ def _carregar_focus_raw() -> pd.DataFrame:
     (data/expectativas/focus_expectativas_anuais.csv).
     Se o arquivo não existir ou estiver ruim, baixa da API do BCB,
     processa e salva o CSV para usos futuros.
+
+    Se o download falhar, devolve um DataFrame vazio – sem memorizar a
+    falha: a próxima chamada tenta de novo.
+    """
+    try:
+        return _carregar_focus_raw_cached()
+    except Exception:
+        return pd.DataFrame()
+
+
+@lru_cache(maxsize=1)
+def _carregar_focus_raw_cached() -> pd.DataFrame:
+    """
+    Miolo memorizado de _carregar_focus_raw. Falha de download/parse SOBE
+    como exceção (o lru_cache não guarda exceções), então só a base boa
+    fica em memória.
     """
     # 1) tentar ler do cache local (modo "offline")
     if FOCUS_CACHE_FILE.exists():
@@ -1101,14 +1239,10 @@ def _carregar_focus_raw() -> pd.DataFrame:
         "&$select=Indicador,IndicadorDetalhe,Data,DataReferencia,Mediana"
     )
 
-    try:
-        resp = _get_with_retry(url)  # usa os defaults: 2 tentativas, 10s
-        dados = resp.json().get("value", [])
-    except Exception:
-        return pd.DataFrame()
-
+    resp = _get_with_retry(url, max_attempts=3, timeout=10)
+    dados = ler_json(resp).get("value", [])
     if not dados:
-        return pd.DataFrame()
+        raise ValueError("Focus anual: resposta sem dados")
 
     df = pd.DataFrame(dados)
 
@@ -1167,7 +1301,7 @@ def _carregar_focus_top5_raw() -> pd.DataFrame:
 
     try:
         resp = _get_with_retry(url)  # usa os defaults: 2 tentativas, 10s
-        dados = resp.json().get("value", [])
+        dados = ler_json(resp).get("value", [])
     except Exception:
         return pd.DataFrame()
 
@@ -1205,6 +1339,19 @@ def _carregar_focus_top5_raw() -> pd.DataFrame:
     return df
 
 
+def _mascara_focus(col_norm: pd.Series, substr: str) -> pd.Series:
+    """
+    Máscara de um filtro de texto do Focus (coluna já normalizada):
+    tenta primeiro match EXATO (pra não misturar IPCA com IPCA
+    Administrados etc.); se não achar nada exato, cai pro .contains.
+    """
+    alvo = _normalizar_str(substr)
+    mask = col_norm == alvo
+    if not mask.any():
+        mask = col_norm.str.contains(alvo, na=False)
+    return mask
+
+
 def buscar_focus_expectativa_anual(
     indicador_substr: str,
     ano_desejado: int,
@@ -1216,36 +1363,37 @@ def buscar_focus_expectativa_anual(
     - Tenta match EXATO do nome do indicador (em vez de só .contains),
       pra não misturar IPCA com IPCA Administrados etc.
     - Agrupa por Data para ficar com um valor por boletim Focus.
+
+    O resultado fica memorizado por (indicador, detalhe, ano): vários
+    indicadores na mesma página (e cada re-render) não refazem o filtro
+    sobre a base inteira.
     """
-    df = _carregar_focus_raw().copy()
-    if df.empty:
+    try:
+        return _focus_cached(indicador_substr, detalhe_substr, int(ano_desejado))
+    except Exception:
         return "-"
 
-    # filtra ano de referência
-    mask = df["ano_ref"] == ano_desejado
-
-    # -------- filtro do indicador (IPCA, PIB, Selic, Câmbio...) --------
-    ind_norm = _normalizar_str(indicador_substr)
-    col_ind = df["indicador_norm"]
-
-    # tenta primeiro match EXATO
-    mask_ind = col_ind == ind_norm
-    if not mask_ind.any():
-        # se não achar nada exato, cai pro comportamento antigo (.contains)
-        mask_ind = col_ind.str.contains(ind_norm, na=False)
 
-    mask &= mask_ind
+@lru_cache(maxsize=64)
+def _focus_cached(
+    indicador_substr: str,
+    detalhe_substr: Optional[str],
+    ano_desejado: int,
+):
+    """
+    Miolo de buscar_focus_expectativa_anual (float ou "-"). Lê a base
+    pelo _carregar_focus_raw_cached: se o download falhar, a exceção sobe
+    até buscar_focus_expectativa_anual e o "-" não fica memorizado aqui.
+    """
+    df = _carregar_focus_raw_cached()
+    if df.empty:
+        return "-"
 
-    # -------- filtro de detalhe, se usado (em alguns indicadores) --------
+    # filtra ano de referência + indicador (+ detalhe, em alguns indicadores)
+    mask = df["ano_ref"] == ano_desejado
+    mask &= _mascara_focus(df["indicador_norm"], indicador_substr)
     if detalhe_substr:
-        det_norm = _normalizar_str(detalhe_substr)
-        col_det = df["detalhe_norm"]
-
-        mask_det = col_det == det_norm
-        if not mask_det.any():
-            mask_det = col_det.str.contains(det_norm, na=False)
-
-        mask &= mask_det
+        mask &= _mascara_focus(df["detalhe_norm"], detalhe_substr)
 
     df_f = df[mask].copy()
     if df_f.empty:
@@ -1282,44 +1430,73 @@ def _resumo_semanal_expectativa_anual(
     - "semana_4": valor de 4 semanas atrás
     - "comp":     texto '▲ (3)', '▼ (1)', '= (2)', etc.
     """
-    df = _carregar_focus_raw().copy()
+    df = _carregar_focus_raw()
     if df.empty:
         return {}
 
-    # 1) filtra pelo ano
+    # filtra pelo ano, pelo indicador (IPCA, PIB, Selic, câmbio...) e pelo
+    # detalhe, se houver (ex.: "Top 5", etc.)
     mask = df["ano_ref"] == ano_desejado
+    mask &= _mascara_focus(df["indicador_norm"], indicador_substr)
+    if detalhe_substr:
+        mask &= _mascara_focus(df["detalhe_norm"], detalhe_substr)
 
-    # 2) filtra pelo indicador (IPCA, PIB, Selic, câmbio...)
-    ind_norm = _normalizar_str(indicador_substr)
-    col_ind = df["indicador_norm"]
-    mask_ind = col_ind == ind_norm
-    if not mask_ind.any():
-        mask_ind = col_ind.str.contains(ind_norm, na=False)
-    mask &= mask_ind
+    return _resumo_semanal_das_linhas(df[mask])
 
-    # 3) filtra pelo detalhe, se houver (ex.: "Top 5", etc.)
-    if detalhe_substr:
-        det_norm = _normalizar_str(detalhe_substr)
-        col_det = df["detalhe_norm"]
-        mask_det = col_det == det_norm
-        if not mask_det.any():
-            mask_det = col_det.str.contains(det_norm, na=False)
-        mask &= mask_det
 
-    df_f = df[mask].copy()
+def _resumos_semanais_focus(
+    pedidos: List[Tuple[str, Optional[str]]],
+    anos: List[int],
+) -> Dict[Tuple[str, Optional[str], int], Dict[str, Optional[float]]]:
+    """
+    Mesmo cálculo de _resumo_semanal_expectativa_anual para vários
+    (indicador, detalhe) x anos de uma vez, como na tabela do Focus.
+
+    A base é lida uma vez e cada máscara (ano, indicador, detalhe) é
+    montada uma única vez sobre ela; cada célula só combina máscaras
+    prontas, em vez de varrer a base inteira de novo.
+    """
+    df = _carregar_focus_raw()
+    if df.empty:
+        return {(ind, det, ano): {} for ind, det in pedidos for ano in anos}
+
+    masks_ano = {ano: df["ano_ref"] == ano for ano in anos}
+    masks_ind: Dict[str, pd.Series] = {}
+    masks_det: Dict[str, pd.Series] = {}
+
+    resumos = {}
+    for ind, det in pedidos:
+        if ind not in masks_ind:
+            masks_ind[ind] = _mascara_focus(df["indicador_norm"], ind)
+        mask_base = masks_ind[ind]
+        if det:
+            if det not in masks_det:
+                masks_det[det] = _mascara_focus(df["detalhe_norm"], det)
+            mask_base = mask_base & masks_det[det]
+
+        for ano in anos:
+            resumos[(ind, det, ano)] = _resumo_semanal_das_linhas(
+                df[masks_ano[ano] & mask_base]
+            )
+    return resumos
+
+
+def _resumo_semanal_das_linhas(df_f: pd.DataFrame) -> Dict[str, Optional[float]]:
+    """Resumo semanal (ver _resumo_semanal_expectativa_anual) das linhas já filtradas."""
     if df_f.empty:
         return {}
+    df_f = df_f.copy()
 
-    # 4) datas válidas
+    # 1) datas válidas
     df_f["Data"] = pd.to_datetime(df_f["Data"], errors="coerce")
     df_f = df_f.dropna(subset=["Data"])
     if df_f.empty:
         return {}
 
-    # 5) semana Focus = semana que termina na sexta (W-FRI)
+    # 2) semana Focus = semana que termina na sexta (W-FRI)
     df_f["semana_focus"] = df_f["Data"].dt.to_period("W-FRI")
 
-    # 6) dentro de cada semana, pega o ÚLTIMO valor
+    # 3) dentro de cada semana, pega o ÚLTIMO valor
     df_sem = (
         df_f.sort_values("Data")
         .groupby("semana_focus", as_index=False)
@@ -1328,7 +1505,7 @@ def _resumo_semanal_expectativa_anual(
     if df_sem.empty:
         return {}
 
-    # 7) valores e diferença na MESMA base do PDF (2 casas decimais)
+    # 4) valores e diferença na MESMA base do PDF (2 casas decimais)
     df_sem["Mediana_float"] = df_sem["Mediana"].astype(float)
     df_sem["Mediana_round"] = df_sem["Mediana_float"].round(2)
     df_sem["Diff_vs_ant"] = df_sem["Mediana_round"].diff()
@@ -1349,7 +1526,7 @@ def _resumo_semanal_expectativa_anual(
 
     df_sem["Seta"] = df_sem["Diff_vs_ant"].apply(_classificar_mov)
 
-    # 8) calcula o streak (quantas semanas seguidas nesse comportamento)
+    # 5) calcula o streak (quantas semanas seguidas nesse comportamento)
     setas = df_sem["Seta"].tolist()
     streaks = []
     ultimo = None
@@ -1396,22 +1573,23 @@ def buscar_focus_top5_expectativa_anual(
     OBS.: o endpoint Top5 não traz "IndicadorDetalhe", então `detalhe_substr`
     é ignorado (mantido só para compatibilidade de assinatura).
     """
-    df = _carregar_focus_top5_raw().copy()
+    df = _carregar_focus_top5_raw()
     if df.empty:
         return "-"
 
-    # filtra pelo ano desejado
+    # filtra pelo ano desejado e pelo indicador (IPCA, PIB, Selic, câmbio...)
     mask = df["ano_ref"] == ano_desejado
+    mask &= df["indicador_norm"].str.contains(
+        _normalizar_str(indicador_substr), na=False
+    )
+    return _mediana_top5_mais_recente(df[mask])
 
-    # filtra pelo indicador (IPCA, PIB, Selic, câmbio...)
-    ind_norm = _normalizar_str(indicador_substr)
-    mask &= df["indicador_norm"].str.contains(ind_norm, na=False)
 
-    df_f = df[mask]
+def _mediana_top5_mais_recente(df_f: pd.DataFrame):
+    """Mediana da linha com a Data mais recente (float ou "-")."""
     if df_f.empty:
         return "-"
 
-    # pega a mediana mais recente
     df_f = df_f.sort_values("Data", ascending=False)
     med = df_f.iloc[0].get("Mediana", None)
 
@@ -1421,6 +1599,30 @@ def buscar_focus_top5_expectativa_anual(
         return "-"
 
 
+def _focus_top5_em_lote(
+    indicadores: List[str],
+    anos: List[int],
+) -> Dict[Tuple[str, int], object]:
+    """
+    buscar_focus_top5_expectativa_anual para vários indicadores x anos de
+    uma vez: a base Top5 é lida uma vez e cada máscara (ano, indicador) é
+    montada uma única vez; cada célula só combina as duas.
+    """
+    df = _carregar_focus_top5_raw()
+    if df.empty:
+        return {(ind, ano): "-" for ind in indicadores for ano in anos}
+
+    masks_ano = {ano: df["ano_ref"] == ano for ano in anos}
+    valores = {}
+    for ind in indicadores:
+        mask_ind = df["indicador_norm"].str.contains(_normalizar_str(ind), na=False)
+        for ano in anos:
+            valores[(ind, ano)] = _mediana_top5_mais_recente(
+                df[masks_ano[ano] & mask_ind]
+            )
+    return valores
+
+
 def montar_tabela_focus() -> pd.DataFrame:
     """
     Monta a tabela consolidada de expectativas Focus por ano,
@@ -1460,15 +1662,17 @@ def montar_tabela_focus() -> pd.DataFrame:
 
     linhas: List[List[str]] = []
 
+    # todas as células de uma vez (uma leitura da base do Focus)
+    resumos = _resumos_semanais_focus(
+        [(indicador_sub, detalhe_sub) for _, indicador_sub, detalhe_sub, _ in configs],
+        anos,
+    )
+
     for nome_exibicao, indicador_sub, detalhe_sub, eh_percentual in configs:
         linha: List[str] = [nome_exibicao]
 
         for ano in anos:
-            resumo = _resumo_semanal_expectativa_anual(
-                indicador_sub,
-                ano,
-                detalhe_sub,
-            )
+            resumo = resumos[(indicador_sub, detalhe_sub, ano)]
 
             if not resumo:
                 linha.extend(["-"] * len(subcolunas))
@@ -1518,13 +1722,15 @@ def montar_tabela_focus_top5() -> pd.DataFrame:
 
     linhas: List[Dict[str, str]] = []
 
+    # as 8 células de uma vez (uma leitura da base Top5); detalhe_sub é
+    # ignorado no Top5, como em buscar_focus_top5_expectativa_anual
+    valores = _focus_top5_em_lote([cfg[1] for cfg in configs], anos)
+
     for nome_exibicao, indicador_sub, detalhe_sub, eh_percentual in configs:
         linha: Dict[str, str] = {"Indicador": nome_exibicao}
 
         for ano in anos:
-            valor = buscar_focus_top5_expectativa_anual(
-                indicador_sub, ano, detalhe_sub
-            )
+            valor = valores[(indicador_sub, ano)]
 
             if isinstance(valor, (int, float)):
                 if eh_percentual:
@@ -1655,7 +1861,7 @@ def montar_tabela_selic_meta() -> pd.DataFrame:
         if df.empty:
             raise ValueError("Sem dados da Selic Meta.")
 
-        df = df.sort_values("data").reset_index(drop=True)
+        df = _ensure_sorted(df)
 
         # Última observação (nível atual)
         ult = df.iloc[-1]
@@ -1745,50 +1951,28 @@ def montar_tabela_cdi() -> pd.DataFrame:
         if df.empty:
             raise ValueError("Sem dados do CDI.")
 
-        df = df.sort_values("data").reset_index(drop=True)
+        df = _ensure_sorted(df)
 
-        ult = df.iloc[-1]
-        data_ult = ult["data"]
-        taxa_ult = ult["valor"]  # % a.d.
+        data_ult = df["data"].iat[-1]
+        taxa_ult = df["valor"].iat[-1]  # % a.d.
 
-        ano_ref = data_ult.year
-        mes_ref = data_ult.month
+        # Uma passada só: soma acumulada de log(1 + taxa) (NaN conta como
+        # fator 1, igual ao prod() do pandas). O fator composto de uma janela
+        # que vai de i até a última observação é exp(cum[-1] - cum[i]); o
+        # início de cada janela sai de busca binária nas datas ordenadas.
+        # A última observação está em todas as janelas (nenhuma fica vazia).
+        datas = df["data"].to_numpy()
+        logs = np.log1p(df["valor"].to_numpy(dtype=np.float64) / 100.0)
+        cum = np.concatenate(([0.0], np.cumsum(np.where(np.isnan(logs), 0.0, logs))))
 
-        # ---------- CDI no mês ----------
-        df_mes = df[
-            (df["data"].dt.year == ano_ref) & (df["data"].dt.month == mes_ref)
-        ]
-        if not df_mes.empty:
-            fator_mes = (1 + df_mes["valor"] / 100).prod()
-            cdi_mes = (fator_mes - 1) * 100.0
-        else:
-            cdi_mes = float("nan")
+        def _cdi_desde(corte) -> float:
+            i = _indice_corte(datas, corte)
+            return float(np.expm1(cum[-1] - cum[i]) * 100.0)
 
-        # ---------- CDI no ano ----------
-        df_ano = df[df["data"].dt.year == ano_ref]
-        if not df_ano.empty:
-            fator_ano = (1 + df_ano["valor"] / 100).prod()
-            cdi_ano = (fator_ano - 1) * 100.0
-        else:
-            cdi_ano = float("nan")
-
-        # ---------- CDI em 12 meses ----------
-        corte_12m = data_ult - relativedelta(years=1)
-        df_12m = df[df["data"] >= corte_12m]
-        if not df_12m.empty:
-            fator_12m = (1 + df_12m["valor"] / 100).prod()
-            cdi_12m = (fator_12m - 1) * 100.0
-        else:
-            cdi_12m = float("nan")
-
-        # ---------- CDI em 24 meses ----------
-        corte_24m = data_ult - relativedelta(years=2)
-        df_24m = df[df["data"] >= corte_24m]
-        if not df_24m.empty:
-            fator_24m = (1 + df_24m["valor"] / 100).prod()
-            cdi_24m = (fator_24m - 1) * 100.0
-        else:
-            cdi_24m = float("nan")
+        cdi_mes = _cdi_desde(date(data_ult.year, data_ult.month, 1))
+        cdi_ano = _cdi_desde(date(data_ult.year, 1, 1))
+        cdi_12m = _cdi_desde(_corte_anos(data_ult, 1))
+        cdi_24m = _cdi_desde(_corte_anos(data_ult, 2))
 
         linhas.append(
             {
@@ -2096,11 +2280,12 @@ def montar_tabela_di_futuro() -> pd.DataFrame:
     (sem a coluna de contratos em aberto).
     """
     linhas: List[Dict[str, str]] = []
+    vencs_raw: List[Optional[str]] = []
 
     try:
         url = "https://cotacao.b3.com.br/mds/api/v1/DerivativeQuotation/DI1"
         resp = _get_with_retry(url, timeout=30)
-        data = resp.json()
+        data = ler_json(resp)
 
         scty_list = data.get("Scty", [])
 
@@ -2120,16 +2305,9 @@ def montar_tabela_di_futuro() -> pd.DataFrame:
             asst_summary = asset.get("AsstSummry") or {}
             scty_qtn = item.get("SctyQtn") or {}
 
-            # Vencimento
-            mtrty_str = asst_summary.get("mtrtyCode")
-            try:
-                if mtrty_str:
-                    mtrty_dt = datetime.strptime(mtrty_str, "%Y-%m-%d").date()
-                    vencimento_fmt = mtrty_dt.strftime("%d/%m/%Y")
-                else:
-                    vencimento_fmt = "-"
-            except Exception:
-                vencimento_fmt = "-"
+            # Vencimento: só guarda o texto; a conversão é feita em lote
+            # depois do laço (converter_vencimentos)
+            vencs_raw.append(asst_summary.get("mtrtyCode"))
 
             # Taxas e variação
             taxa_atual = scty_qtn.get("curPrc")
@@ -2162,7 +2340,6 @@ def montar_tabela_di_futuro() -> pd.DataFrame:
             linhas.append(
                 {
                     "Contrato": symb,
-                    "Vencimento": vencimento_fmt,
                     "Taxa (%)": fmt_taxa(taxa_atual),
                     "Taxa dia ant. (%)": fmt_taxa(taxa_ant),
                     "Variação (bps)": fmt_bps(variacao_bps),
@@ -2175,18 +2352,21 @@ def montar_tabela_di_futuro() -> pd.DataFrame:
         df = pd.DataFrame(linhas)
 
         # -------------------------------------------------------------
-        # Ordena por vencimento (convertendo a string de volta para data)
+        # Vencimentos convertidos de uma vez e ordenação pela própria
+        # data (sem vencimento vão para o fim)
         # -------------------------------------------------------------
-        def parse_venc(x: str):
-            try:
-                return datetime.strptime(x, "%d/%m/%Y").date()
-            except Exception:
-                # empurra valores inválidos para o fim
-                return datetime.max.date()
+        vencimentos = converter_vencimentos(vencs_raw)
+        df.insert(
+            1,
+            "Vencimento",
+            [v.strftime("%d/%m/%Y") if v is not None else "-" for v in vencimentos],
+        )
 
-        df = df.sort_values(by="Vencimento", key=lambda s: s.apply(parse_venc)).reset_index(
-            drop=True
+        ordem = sorted(
+            range(len(vencimentos)),
+            key=lambda i: vencimentos[i] or date.max,
         )
+        df = df.iloc[ordem].reset_index(drop=True)
 
         return df
 
@@ -3565,6 +3745,70 @@ def render_bloco7_credito_condicoes():
     )
 
 
+# =============================================================================
+# PRÉ-CARGA DAS SÉRIES (SGS + SIDRA) EM PARALELO
+# =============================================================================
+
+# Produtores cacheados (lru_cache + disco) usados pelas tabelas do painel
+_SERIES_PAINEL: Dict[str, Callable[[], pd.DataFrame]] = {
+    "selic_meta_aa": buscar_selic_meta_aa,
+    "cdi_diario": buscar_cdi_diario,
+    "ptax_venda": buscar_ptax_venda,
+    "ipca": buscar_ipca_ibge,
+    "ipca15": buscar_ipca15_ibge,
+    "pmc_mom": buscar_pmc_var_mom_ajustada,
+    "pmc_ano": buscar_pmc_var_acum_ano,
+    "pmc_12m": buscar_pmc_var_acum_12m,
+    "pms_mom": buscar_pms_var_mom_ajustada,
+    "pms_ano": buscar_pms_var_acum_ano,
+    "pms_12m": buscar_pms_var_acum_12m,
+    "pim_mom": buscar_pim_var_mom_ajustada,
+    "pim_ano": buscar_pim_var_acum_ano,
+    "pim_12m": buscar_pim_var_acum_12m,
+}
+
+
+def prefetch_all() -> Dict[str, Optional[pd.DataFrame]]:
+    """
+    Dispara todas as séries de _SERIES_PAINEL ao mesmo tempo (threads na
+    sessão _HTTP, que tem pool para isso). Cada produtor tem lru_cache, então
+    as tabelas montadas logo depois só leem da memória: o tempo de um
+    carregamento frio vira o da série mais lenta, não a soma de todas.
+
+    Erro numa série não derruba as outras: ela fica como None aqui e a
+    tabela correspondente tenta de novo (e mostra o erro) como antes.
+    """
+    with ThreadPoolExecutor(max_workers=len(_SERIES_PAINEL)) as pool:
+        futuros = {
+            nome: pool.submit(buscar) for nome, buscar in _SERIES_PAINEL.items()
+        }
+
+    series: Dict[str, Optional[pd.DataFrame]] = {}
+    for nome, fut in futuros.items():
+        try:
+            series[nome] = fut.result()
+        except Exception as exc:
+            logging.warning("Pré-carga da série %s falhou: %s", nome, exc)
+            series[nome] = None
+    return series
+
+
+@st.cache_data(ttl=60 * 30, show_spinner=False)  # mesmo TTL das tabelas
+def prefetch_painel(chave_dia: str) -> bool:
+    """
+    prefetch_all() só com as tabelas frias: roda no primeiro carregamento
+    (e depois do botão "Atualizar dados", que limpa o st.cache_data) e
+    volta a rodar quando as tabelas de 30 min expiram. Num rerun com as
+    tabelas quentes não dispara thread nem chamada de rede – nem repete o
+    timeout de uma série que está falhando.
+
+    `chave_dia` (aaaa-mm-dd) só entra na chave do cache. Devolve True
+    (só marca que a pré-carga rodou; as séries ficam nos lru_cache).
+    """
+    prefetch_all()
+    return True
+
+
 # =============================================================================
 # WRAPPERS CACHEADOS (Streamlit) PARA AS TABELAS
 # =============================================================================
@@ -3587,52 +3831,58 @@ def get_comparacao_tesouro_ipca_vs_curva():
     return comparar_tesouro_ipca_vs_curva()
 
 
-@st.cache_data(ttl=60 * 30)  # 30 minutos
+# Os get_tabela_* rodam em paralelo dentro do spinner do main():
+# show_spinner=False evita um "Running ..." por função na tela.
+
+
+@st.cache_data(ttl=60 * 30, show_spinner=False)  # 30 minutos
 def get_tabela_inflacao():
     return montar_tabela_inflacao()
 
 
-@st.cache_data(ttl=60 * 30)
+@st.cache_data(ttl=60 * 30, show_spinner=False)
 def get_tabela_atividade():
     return montar_tabela_atividade_economica()
 
 
-@st.cache_data(ttl=60 * 30)
-def get_tabela_focus():
+@st.cache_data(ttl=60 * 30, show_spinner=False)
+def get_tabela_focus(chave_dia: str):
+    """`chave_dia` (aaaa-mm-dd) só entra na chave do cache: vira o dia, recalcula."""
     return montar_tabela_focus()
 
 
-@st.cache_data(ttl=60 * 30)
-def get_tabela_focus_top5():
+@st.cache_data(ttl=60 * 30, show_spinner=False)
+def get_tabela_focus_top5(chave_dia: str):
+    """Idem get_tabela_focus (os anos da tabela dependem da data de hoje)."""
     return montar_tabela_focus_top5()
 
 
-@st.cache_data(ttl=60 * 30)
+@st.cache_data(ttl=60 * 30, show_spinner=False)
 def get_tabela_selic():
     return montar_tabela_selic_meta()
 
 
-@st.cache_data(ttl=60 * 30)
+@st.cache_data(ttl=60 * 30, show_spinner=False)
 def get_tabela_cdi():
     return montar_tabela_cdi()
 
 
-@st.cache_data(ttl=60 * 30)
+@st.cache_data(ttl=60 * 30, show_spinner=False)
 def get_tabela_ptax():
     return montar_tabela_ptax()
 
 
-@st.cache_data(ttl=60 * 60 * 24)
+@st.cache_data(ttl=60 * 60 * 24, show_spinner=False)
 def get_tabela_ibovespa_curto():
     return montar_tabela_ibovespa()
 
 
-@st.cache_data(ttl=60 * 10)
+@st.cache_data(ttl=60 * 10, show_spinner=False)
 def get_tabela_di_futuro():
     return montar_tabela_di_futuro()
 
 
-@st.cache_data(ttl=60 * 10)
+@st.cache_data(ttl=60 * 10, show_spinner=False)
 def get_historico_di_futuro():
     """
     Lê o CSV de histórico de DI Futuro (data/di_futuro/di1_historico.csv).
@@ -3645,6 +3895,31 @@ def get_historico_di_futuro():
         return pd.DataFrame()
 
 
+def limpar_caches_painel() -> None:
+    """
+    Botão "Atualizar dados": descarta as tabelas do st.cache_data, os
+    lru_cache em memória das séries/Focus e os memos dos blocos de curto
+    prazo e macro/fiscal, e marca o cache em disco das séries SGS/SIDRA
+    como vencido (invalidar_cache_disco): a próxima leitura vai à rede,
+    com o arquivo antigo ainda como reserva se a API falhar.
+    """
+    invalidar_cache_disco()
+
+    st.cache_data.clear()
+    carregar_dados_curto_prazo_br.cache_clear()
+    carregar_dados_macro_fiscal_br.cache_clear()
+    for fn in (
+        _buscar_serie_sgs_cached,
+        _buscar_serie_mensal_ibge_cached,
+        _buscar_serie_sidra_valor_cached,
+        _carregar_focus_raw_cached,
+        _carregar_focus_top5_raw,
+        _carregar_focus_mensais_raw,
+        _focus_cached,
+    ):
+        fn.cache_clear()
+
+
 # =============================================================================
 # STREAMLIT - INTERFACE
 # =============================================================================
@@ -3680,6 +3955,28 @@ def atualizar_dados_externos_cache(chave_dia: str) -> bool:
     return True
 
 
+def _carregar_tabelas_em_paralelo(
+    tarefas: Dict[str, Callable[[], pd.DataFrame]],
+) -> Dict[str, pd.DataFrame]:
+    """
+    Roda os get_tabela_* ao mesmo tempo (são independentes e passam a maior
+    parte do tempo esperando BCB/IBGE/B3). Cada thread recebe o contexto
+    do script do Streamlit, para o st.cache_data funcionar nelas como na
+    thread principal. Os montar_tabela_* já tratam os próprios erros; um
+    erro que escape sobe aqui, como na versão sequencial.
+    """
+    ctx = get_script_run_ctx()
+
+    def _com_contexto() -> None:
+        add_script_run_ctx(threading.current_thread(), ctx)
+
+    with ThreadPoolExecutor(
+        max_workers=len(tarefas), initializer=_com_contexto
+    ) as pool:
+        futuros = {nome: pool.submit(tarefa) for nome, tarefa in tarefas.items()}
+    return {nome: fut.result() for nome, fut in futuros.items()}
+
+
 def main():
     st.set_page_config(
         page_title="Observatório Macro",
@@ -3720,17 +4017,42 @@ def main():
 
     st.write("---")
 
+    if st.button("Atualizar dados"):
+        limpar_caches_painel()
+
+    chave_dia = date.today().isoformat()
+
     with st.spinner("Buscando dados mais recentes..."):
-        df_infla = get_tabela_inflacao()
-        df_ativ = get_tabela_atividade()
-        df_focus = get_tabela_focus()
-        df_focus_top5 = get_tabela_focus_top5()
-        df_selic = get_tabela_selic()
-        df_cdi = get_tabela_cdi()
-        df_ptax = get_tabela_ptax()
-        df_ibov_curto = get_tabela_ibovespa_curto()
-        df_di_fut = get_tabela_di_futuro()
-        df_hist_di = get_historico_di_futuro()
+        # baixa as séries SGS/SIDRA em paralelo (só com as tabelas
+        # frias); as tabelas abaixo encontram tudo no lru_cache
+        prefetch_painel(chave_dia)
+
+        # ... e monta as tabelas em paralelo (Focus, Ibovespa e DI ainda
+        # vão à rede; o resto é pandas sobre o cache)
+        tabelas = _carregar_tabelas_em_paralelo(
+            {
+                "infla": get_tabela_inflacao,
+                "ativ": get_tabela_atividade,
+                "focus": lambda: get_tabela_focus(chave_dia),
+                "focus_top5": lambda: get_tabela_focus_top5(chave_dia),
+                "selic": get_tabela_selic,
+                "cdi": get_tabela_cdi,
+                "ptax": get_tabela_ptax,
+                "ibov_curto": get_tabela_ibovespa_curto,
+                "di_fut": get_tabela_di_futuro,
+                "hist_di": get_historico_di_futuro,
+            }
+        )
+        df_infla = tabelas["infla"]
+        df_ativ = tabelas["ativ"]
+        df_focus = tabelas["focus"]
+        df_focus_top5 = tabelas["focus_top5"]
+        df_selic = tabelas["selic"]
+        df_cdi = tabelas["cdi"]
+        df_ptax = tabelas["ptax"]
+        df_ibov_curto = tabelas["ibov_curto"]
+        df_di_fut = tabelas["di_fut"]
+        df_hist_di = tabelas["hist_di"]
 
 
     # ==========
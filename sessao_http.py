@@ -0,0 +1,74 @@
+# sessao_http.py
+# -*- coding: utf-8 -*-
+
+# Sessões HTTP compartilhadas (requests.Session + pool de conexões).
+# Cada módulo que baixa dados cria UMA sessão no import e reaproveita
+# para todas as chamadas: keep-alive evita refazer o handshake TCP/TLS
+# a cada requisição (BCB, Ipeadata e B3 são todos HTTPS). O Session é
+# seguro para gets concorrentes vindos de threads diferentes.
+
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # parser JSON mais rápido (opcional)
+except ImportError:  # sem orjson: usa o resp.json() do requests
+    orjson = None
+
+
+def criar_sessao(
+    headers: Optional[Dict[str, str]] = None,
+    tentativas: int = 2,
+    backoff_factor: float = 0.3,
+    status_forcelist: Iterable[int] = (502, 503, 504),
+    pool_connections: int = 8,
+    pool_maxsize: int = 16,
+) -> requests.Session:
+    """
+    Cria uma requests.Session com HTTPAdapter montado em http/https.
+
+    - headers: cabeçalhos fixos da sessão (ex.: User-Agent da B3). A
+      sessão sempre declara Accept-Encoding com todas as compressões que
+      o urllib3 sabe abrir aqui (gzip/deflate; br/zstd se os pacotes
+      brotli/zstandard estiverem instalados), e o requests descomprime
+      sozinho; um Accept-Encoding em `headers` tem precedência;
+    - tentativas: retries automáticos (erro de conexão, timeout de
+      leitura e os status de `status_forcelist`), com backoff exponencial
+      de `backoff_factor`; 0 = sem retry;
+    - pool_connections / pool_maxsize: conexões mantidas abertas por host.
+    """
+    retry = Retry(
+        total=tentativas,
+        backoff_factor=backoff_factor,
+        status_forcelist=tuple(status_forcelist),
+        allowed_methods=("GET",),
+    )
+    adaptador = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+
+    sessao = requests.Session()
+    sessao.mount("https://", adaptador)
+    sessao.mount("http://", adaptador)
+    sessao.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    if headers:
+        sessao.headers.update(headers)
+    return sessao
+
+
+def ler_json(resp: requests.Response) -> Any:
+    """
+    Decodifica o corpo JSON da resposta com orjson (bem mais rápido em
+    payloads grandes, como o histórico do Ipeadata), ou com o resp.json()
+    do requests se o orjson não estiver instalado. Erros de parse saem
+    como ValueError nos dois casos.
+    """
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
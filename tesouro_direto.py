@@ -9,14 +9,18 @@ from functools import lru_cache
 from typing import List, Optional
 
 import pandas as pd
-import requests
 from pathlib import Path
 
+from sessao_http import criar_sessao
+
 # Pasta onde vamos guardar o CSV bruto do Tesouro Direto
 BASE_DIR = Path(__file__).resolve().parent
 TD_DATA_DIR = BASE_DIR / "data" / "curvas_tesouro" / "tesouro_direto"
 TD_DATA_PATH = TD_DATA_DIR / "tesouro_direto_bruto.csv"
 
+# sessão única (keep-alive + pool) para o Tesouro Transparente
+_HTTP = criar_sessao()
+
 
 TESOURO_CSV_URL = (
     "https://www.tesourotransparente.gov.br/ckan/dataset/"
@@ -46,7 +50,7 @@ def carregar_tesouro_bruto() -> pd.DataFrame:
         pass
 
     # 2) Fallback: baixa on-line do Tesouro Transparente
-    resp = requests.get(TESOURO_CSV_URL, timeout=60)
+    resp = _HTTP.get(TESOURO_CSV_URL, timeout=60)
     resp.raise_for_status()
 
 
@@ -73,7 +77,7 @@ def atualizar_cache_tesouro_bruto() -> pd.DataFrame:
 
     Usado pelo job pesado (atualiza_dados_pesados.py), fora do Streamlit.
     """
-    resp = requests.get(TESOURO_CSV_URL, timeout=60)
+    resp = _HTTP.get(TESOURO_CSV_URL, timeout=60)
     resp.raise_for_status()
 
 